@@ -0,0 +1,64 @@
+"""Benchmark : décodage des pages, apparent_encoding vs résolution en cascade
+
+L'ancienne implémentation lançait la détection statistique sur tout le corps
+de chaque réponse (response.apparent_encoding). charset.decode_html s'arrête
+dès qu'une source fiable donne l'encodage (BOM, en-tête, <meta>, UTF-8 valide)
+et ne détecte que sur un préfixe borné en dernier recours.
+
+Usage : python benchmarks/bench_charset.py [--size 200] [--pages 20]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from requests.compat import chardet
+
+from charset import decode_html
+
+
+def build_page(size_kb, meta=''):
+    paragraph = "<p>Le café était très apprécié à côté de la gare, où l'on mangeait des crêpes.</p>\n"
+    body = paragraph * (size_kb * 1024 // len(paragraph.encode('utf-8')) + 1)
+    return f"<!DOCTYPE html><html><head>{meta}<title>Test</title></head><body>{body}</body></html>"
+
+
+def old_decode(data):
+    """Ancienne méthode : détection sur tout le corps, en-tête ignoré"""
+    encoding = chardet.detect(data)['encoding'] or 'utf-8'
+    return str(data, encoding, errors='replace')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=200, help="taille des pages en Ko")
+    parser.add_argument('--pages', type=int, default=20)
+    args = parser.parse_args()
+
+    cases = [
+        ("en-tête charset=utf-8", build_page(args.size).encode('utf-8'), 'text/html; charset=utf-8'),
+        ("<meta charset> seul", build_page(args.size, '<meta charset="utf-8">').encode('utf-8'), 'text/html'),
+        ("rien, UTF-8", build_page(args.size).encode('utf-8'), 'text/html'),
+        ("rien, windows-1252", build_page(args.size).encode('cp1252'), 'text/html'),
+    ]
+
+    print(f"{args.pages} pages de {args.size} Ko par cas")
+    for label, data, content_type in cases:
+        start = time.perf_counter()
+        for _ in range(args.pages):
+            old_decode(data)
+        old_time = (time.perf_counter() - start) / args.pages
+
+        start = time.perf_counter()
+        for _ in range(args.pages):
+            _, source = decode_html(data, content_type)
+        new_time = (time.perf_counter() - start) / args.pages
+
+        print(f"  {label:<22}: {old_time * 1000:8.2f} ms -> {new_time * 1000:6.2f} ms par page "
+              f"(x{old_time / new_time:.0f}, source: {source})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark : rendu des overlays par gabarits compilés vs f-strings
+
+L'ancienne implémentation construisait chaque overlay avec une grande f-string
+et concaténait les liens capturés dans une boucle. Pour comparer à balisage
+identique, la version f-string est générée à partir des mêmes gabarits, sans
+échappement comme avant puis avec, pour isoler le coût de html.escape.
+
+Usage : python benchmarks/bench_templates.py [--pages 2000] [--links 30]
+"""
+import argparse
+import sys
+import time
+from html import escape
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from templating import PLACEHOLDER, TemplateLibrary
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+def fstring_renderer(source, name, escaped=False):
+    """Compile le gabarit en une fonction f-string render(**ctx)"""
+    parts = []
+    fields = set()
+    position = 0
+    for match in PLACEHOLDER.finditer(source):
+        static = source[position:match.start()].replace('{', '{{').replace('}', '}}')
+        field = match.group(1)
+        if escaped and not match.group(2):
+            field = f"_escape(_str({field}))"
+        parts.append(static + "{" + field + "}")
+        fields.add(match.group(1))
+        position = match.end()
+    parts.append(source[position:].replace('{', '{{').replace('}', '}}'))
+    code = f"def render({', '.join(sorted(fields))}, **_):\n    return f{''.join(parts)!r}\n"
+    namespace = {'_escape': escape, '_str': str}
+    exec(compile(code, f"<fstring {name}>", 'exec'), namespace)
+    return namespace['render']
+
+
+def build_pages(n_pages, n_links):
+    pages = []
+    for i in range(n_pages):
+        links = [{
+            'url': f"https://example.com/section/{i}/article-{j}?ref=<nav>&x=\"1\"",
+            'snapshot_id': f"example_com_article_{i}_{j}",
+            'truncated_url': f"https://example.com/section/{i}/article-{j}",
+            'icon': 'fa-link',
+            'position': j + 1,
+        } for j in range(n_links)]
+        pages.append({
+            'title': f"Page {i} <script>alert(1)</script> & co",
+            'snapshot_id': f"example_com_page_{i}",
+            'url_short': f"https://example.com/page/{i}",
+            'links_found': n_links * 2,
+            'captured_count': n_links,
+            'links_search': '',
+            'domain': 'example.com',
+            'captured_at': '16/10/2026 12:00',
+            'size_kb': 42,
+            'links': links,
+        })
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--links', type=int, default=30)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    library = TemplateLibrary(TEMPLATES_DIR)
+    compile_time = time.perf_counter() - start
+    overlay, link = library['overlay'], library['captured_link']
+    fstring_overlay = fstring_renderer((TEMPLATES_DIR / "overlay.html").read_text(encoding='utf-8'), 'overlay')
+    fstring_link = fstring_renderer((TEMPLATES_DIR / "captured_link.html").read_text(encoding='utf-8'), 'link')
+    escaped_overlay = fstring_renderer((TEMPLATES_DIR / "overlay.html").read_text(encoding='utf-8'), 'overlay', True)
+    escaped_link = fstring_renderer((TEMPLATES_DIR / "captured_link.html").read_text(encoding='utf-8'), 'link', True)
+
+    pages = build_pages(args.pages, args.links)
+
+    # Ancienne approche : f-string + concaténation des liens
+    start = time.perf_counter()
+    for page in pages:
+        links_html = ''
+        for link_data in page['links']:
+            links_html += fstring_link(**link_data)
+        fstring_overlay(**page, links_html=links_html)
+    fstring_time = time.perf_counter() - start
+
+    # Même f-string avec l'échappement des gabarits : isole le coût de html.escape
+    start = time.perf_counter()
+    for page in pages:
+        links_html = ''.join(escaped_link(**link_data) for link_data in page['links'])
+        escaped_overlay(**page, links_html=links_html)
+    escaped_time = time.perf_counter() - start
+
+    # Gabarits compilés, liste des liens rendue en un seul render_many
+    start = time.perf_counter()
+    for page in pages:
+        overlay.render(dict(page, links_html=link.render_many(page['links'])))
+    template_time = time.perf_counter() - start
+
+    print(f"{args.pages} overlays x {args.links} liens capturés")
+    print(f"  Compilation des gabarits : {compile_time * 1000:.2f} ms (une fois au démarrage)")
+    for label, elapsed in (("f-string (sans échappement)", fstring_time),
+                           ("f-string + échappement", escaped_time),
+                           ("gabarits compilés", template_time)):
+        print(f"  {label:<34}: {elapsed * 1000:8.1f} ms  ({args.pages / elapsed:8.0f} pages/s)")
+
+
+if __name__ == '__main__':
+    main()
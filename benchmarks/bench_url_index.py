@@ -0,0 +1,96 @@
+"""Benchmark : recherche "ce lien est-il capturé ?" avec et sans index d'URL
+
+Construit une archive synthétique (100 000 captures par défaut) en mémoire et
+compare le parcours linéaire de self.snapshots (ancienne implémentation) avec
+LocalSnapshot.find_snapshot.
+
+Usage : python benchmarks/bench_url_index.py [--snapshots 100000] [--links 20]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper import LocalSnapshot
+
+
+def build_archive(base_dir, n_snapshots, n_links):
+    """Crée une archive synthétique : chaque page pointe vers n_links autres URLs"""
+    archive = LocalSnapshot(base_dir)
+    rng = random.Random(42)
+    urls = [f"https://site{i % 500}.example/page/{i}" for i in range(n_snapshots)]
+    snapshots = {}
+    for i, url in enumerate(urls):
+        snap_id = f"snap_{i}"
+        # La moitié des liens pointe vers des pages capturées, l'autre vers l'extérieur
+        links = [rng.choice(urls) if j % 2 else f"https://external.example/{i}/{j}"
+                 for j in range(n_links)]
+        snapshots[snap_id] = {
+            'url': url,
+            'title': f"Page {i}",
+            'snapshot_id': snap_id,
+            'links_found': n_links,
+            'links_available': links,
+            'domain': url.split('/')[2],
+        }
+    archive.snapshots.records = snapshots
+    return archive
+
+
+def linear_lookup(snapshots, link):
+    """Ancienne recherche : parcours de toutes les captures"""
+    for snap_data in snapshots.values():
+        if snap_data['url'] == link:
+            return snap_data['snapshot_id']
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--snapshots', type=int, default=100000)
+    parser.add_argument('--links', type=int, default=20)
+    parser.add_argument('--pages', type=int, default=20,
+                        help="pages échantillonnées pour la recherche linéaire")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = build_archive(tmp, args.snapshots, args.links)
+        sample = list(archive.snapshots.values())[:args.pages]
+        sample_links = [link for snap in sample for link in snap['links_available']]
+
+        start = time.perf_counter()
+        archive.snapshots.rebuild_url_index()
+        rebuild_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        linear = [linear_lookup(archive.snapshots, link) for link in sample_links]
+        linear_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed = [archive.find_snapshot(link) for link in sample_links]
+        indexed_time = time.perf_counter() - start
+        assert linear == indexed
+
+        # update_captured_links sur toute l'archive, sans l'écriture disque
+        archive.snapshots.flush = lambda: None
+        start = time.perf_counter()
+        archive.update_captured_links()
+        update_time = time.perf_counter() - start
+
+    print(f"Archive synthétique : {args.snapshots} captures x {args.links} liens")
+    print(f"  Reconstruction de l'index d'URL : {rebuild_time * 1000:.1f} ms")
+    print(f"  {len(sample_links)} recherches linéaires : {linear_time * 1000:.1f} ms "
+          f"({linear_time / len(sample_links) * 1e6:.1f} µs/lien)")
+    print(f"  {len(sample_links)} recherches indexées : {indexed_time * 1000:.3f} ms "
+          f"({indexed_time / len(sample_links) * 1e6:.3f} µs/lien)")
+    print(f"  update_captured_links (index) : {update_time:.2f} s")
+    estimated = linear_time / len(sample_links) * args.snapshots * args.links
+    print(f"  update_captured_links (linéaire, estimé) : {estimated:.0f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Canonicalisation des URLs : une seule forme pour toutes les variantes d'une page"""
+import re
+from fnmatch import fnmatch
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Paramètres de suivi publicitaire qui ne changent pas le contenu de la page
+TRACKING_PARAMS = (
+    'utm_*', 'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'igshid', 'ref_src',
+)
+
+UNRESERVED = re.compile(r'%([0-9A-Fa-f]{2})')
+UNRESERVED_CHARS = set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+
+
+def _normalize_escapes(text):
+    """Décode les caractères non réservés (%41 -> A) et met les autres échappements en majuscules"""
+    def replace(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in UNRESERVED_CHARS else '%' + match.group(1).upper()
+    return UNRESERVED.sub(replace, text)
+
+
+class UrlCanonicalizer:
+    """Normalise une URL selon des règles configurables"""
+    def __init__(self, strip_params=TRACKING_PARAMS, strip_fragment=True, sort_query=True,
+                 strip_trailing_slash=True, remove_default_port=True, strip_www=False):
+        self.strip_params = tuple(p.lower() for p in strip_params)
+        self.strip_fragment = strip_fragment
+        self.sort_query = sort_query
+        self.strip_trailing_slash = strip_trailing_slash
+        self.remove_default_port = remove_default_port
+        self.strip_www = strip_www
+
+    def _keep_param(self, name):
+        name = name.lower()
+        return not any(fnmatch(name, pattern) for pattern in self.strip_params)
+
+    def __call__(self, url):
+        try:
+            parts = urlsplit(url.strip())
+            port = parts.port
+        except ValueError:
+            # URL mal formée (port invalide...) : on la garde telle quelle
+            return url
+        scheme = parts.scheme.lower()
+
+        host = (parts.hostname or '').rstrip('.')
+        if self.strip_www and host.startswith('www.'):
+            host = host[4:]
+        if ':' in host:
+            host = f"[{host}]"  # IPv6
+        if port is not None and not (self.remove_default_port and DEFAULT_PORTS.get(scheme) == port):
+            host = f"{host}:{port}"
+        if parts.username:
+            userinfo = parts.username + (f":{parts.password}" if parts.password else '')
+            host = f"{userinfo}@{host}"
+
+        path = _normalize_escapes(parts.path) or '/'
+        if self.strip_trailing_slash and len(path) > 1 and path.endswith('/'):
+            path = path.rstrip('/') or '/'
+
+        query = parts.query
+        if query:
+            params = [(k, v) for k, v in parse_qsl(query, keep_blank_values=True) if self._keep_param(k)]
+            if self.sort_query:
+                params.sort(key=lambda item: item[0])
+            query = urlencode(params)
+
+        fragment = '' if self.strip_fragment else parts.fragment
+        return urlunsplit((scheme, host, path, query, fragment))
+
+
+def strip_fragment(url):
+    """Retire seulement le #fragment (forme utilisée pour télécharger la page)"""
+    return url.split('#', 1)[0]
@@ -0,0 +1,78 @@
+"""Encodage d'une page HTML : du moins coûteux au plus coûteux
+
+Ordre suivi (celui des navigateurs) : BOM, paramètre charset de l'en-tête
+Content-Type, <meta charset> dans les premiers Ko, UTF-8 strict, et seulement
+en dernier recours une détection statistique sur un préfixe borné.
+"""
+import codecs
+import re
+
+from requests.compat import chardet
+
+# Zone où chercher <meta charset> (les navigateurs s'arrêtent à 1024 octets, on est plus large)
+META_SCAN_BYTES = 4096
+# Préfixe analysé par la détection statistique
+DETECTION_BYTES = 64 * 1024
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+# Étiquettes que le web utilise en pratique pour windows-1252 (norme WHATWG)
+WINDOWS_1252_LABELS = {'iso-8859-1', 'iso8859-1', 'latin1', 'latin-1', 'l1', 'us-ascii', 'ascii'}
+
+SOURCES = ('bom', 'header', 'meta', 'utf8', 'detection', 'default')
+
+
+def _normalize(label):
+    """Nom d'encodage Python pour une étiquette déclarée, ou None si inconnue"""
+    label = label.strip().lower()
+    if label in WINDOWS_1252_LABELS:
+        return 'cp1252'
+    try:
+        name = codecs.lookup(label).name
+    except LookupError:
+        return None
+    # Une page ne peut pas déclarer UTF-16 dans son propre contenu ASCII
+    return 'utf-8' if name.startswith('utf-16') else name
+
+
+def resolve_charset(data, content_type=None):
+    """Retourne (encodage, source) où source est l'une des SOURCES"""
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            return encoding, 'bom'
+
+    if content_type:
+        match = HEADER_CHARSET.search(content_type)
+        if match:
+            encoding = _normalize(match.group(1))
+            if encoding:
+                return encoding, 'header'
+
+    match = META_CHARSET.search(data[:META_SCAN_BYTES])
+    if match:
+        encoding = _normalize(match.group(1).decode('ascii', 'ignore'))
+        if encoding:
+            return encoding, 'meta'
+
+    try:
+        data.decode('utf-8')
+        return 'utf-8', 'utf8'
+    except UnicodeDecodeError:
+        pass
+
+    if chardet is not None:
+        encoding = chardet.detect(data[:DETECTION_BYTES])['encoding']
+        if encoding and _normalize(encoding):
+            return _normalize(encoding), 'detection'
+    return 'cp1252', 'default'
+
+
+def decode_html(data, content_type=None):
+    """Décode le corps d'une page ; retourne (texte, source de l'encodage)"""
+    encoding, source = resolve_charset(data, content_type)
+    return data.decode(encoding, errors='replace'), source
@@ -0,0 +1,177 @@
+"""Recherche plein texte dans le contenu des captures (SQLite FTS5)
+
+L'index est stocké dans fulltext.sqlite à côté du catalogue. Il se construit
+hors ligne à partir des original.html de l'archive (update) ou au fil du crawl
+(add), et se consulte avec search, qui classe les captures par pertinence (BM25).
+"""
+import re
+import sqlite3
+from html.parser import HTMLParser
+from pathlib import Path
+
+# Balises dont le contenu n'est pas du texte affiché dans la page
+NON_TEXT_TAGS = {'script', 'style', 'noscript', 'template', 'title'}
+# Texte conservé par page
+MAX_TEXT_CHARS = 100000
+QUERY_TOKEN = re.compile(r'\w+')
+
+
+class TextExtractor(HTMLParser):
+    """Texte visible d'une page HTML"""
+    def __init__(self, max_chars=MAX_TEXT_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.parts = []
+        self.size = 0
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in NON_TEXT_TAGS:
+            self.skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in NON_TEXT_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth and self.size < self.max_chars:
+            self.parts.append(data)
+            self.size += len(data)
+
+    def text(self):
+        return ' '.join(' '.join(self.parts).split())[:self.max_chars]
+
+
+def extract_text(html, max_chars=MAX_TEXT_CHARS):
+    """Extrait le texte visible (sans scripts ni styles) d'une page"""
+    extractor = TextExtractor(max_chars)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
+
+
+def build_query(text):
+    """Transforme une saisie libre en requête FTS5 : tous les mots, chacun en préfixe"""
+    return ' '.join(f'"{token}"*' for token in QUERY_TOKEN.findall(text))
+
+
+class FullTextIndex:
+    """Index plein texte des captures d'une archive"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            doc_id INTEGER PRIMARY KEY,
+            snapshot_id TEXT NOT NULL UNIQUE,
+            content_sha256 TEXT
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(
+            url, title, body, tokenize = 'unicode61 remove_diacritics 2'
+        );
+    """
+    # Poids BM25 des colonnes (url, title, body) : un mot du titre compte plus
+    WEIGHTS = (2.0, 5.0, 1.0)
+
+    def __init__(self, base_dir, commit_every=100):
+        self.db_file = Path(base_dir) / "fulltext.sqlite"
+        self.conn = sqlite3.connect(self.db_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            self.conn.executescript(self.SCHEMA)
+        except sqlite3.OperationalError as e:
+            self.conn.close()
+            raise RuntimeError(f"SQLite sans FTS5, recherche plein texte indisponible: {e}") from None
+        self.commit_every = commit_every
+        self.pending = 0
+
+    def __contains__(self, snapshot_id):
+        return self.conn.execute(
+            "SELECT 1 FROM documents WHERE snapshot_id = ?", (snapshot_id,)).fetchone() is not None
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def add(self, record, text):
+        """Indexe (ou réindexe) une capture ; validé par lots de commit_every pages"""
+        self.remove(record['snapshot_id'])
+        cursor = self.conn.execute(
+            "INSERT INTO documents (snapshot_id, content_sha256) VALUES (?, ?)",
+            (record['snapshot_id'], record.get('content_sha256')))
+        self.conn.execute(
+            "INSERT INTO pages (rowid, url, title, body) VALUES (?, ?, ?, ?)",
+            (cursor.lastrowid, record['url'], record.get('title') or '', text))
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.commit()
+
+    def remove(self, snapshot_id):
+        row = self.conn.execute(
+            "SELECT doc_id FROM documents WHERE snapshot_id = ?", (snapshot_id,)).fetchone()
+        if row is not None:
+            self.conn.execute("DELETE FROM pages WHERE rowid = ?", (row[0],))
+            self.conn.execute("DELETE FROM documents WHERE doc_id = ?", (row[0],))
+
+    def update(self, archive, rebuild=False):
+        """Indexe les captures de l'archive qui ne le sont pas encore
+
+        archive est un LocalSnapshot. Les pages sont relues une à une depuis leur
+        blob ; les captures disparues du catalogue sont retirées de l'index.
+        Retourne (pages ajoutées, pages retirées).
+        """
+        if rebuild:
+            with self.conn:
+                self.conn.execute("DELETE FROM pages")
+                self.conn.execute("DELETE FROM documents")
+        indexed = {row[0] for row in self.conn.execute("SELECT snapshot_id FROM documents")}
+        stale = set(indexed)
+        added = 0
+        texts = {}  # sha256 -> texte, pour les contenus identiques qui se suivent
+        for snap_data in archive.snapshots.values():
+            snapshot_id = snap_data['snapshot_id']
+            if snapshot_id in indexed:
+                stale.discard(snapshot_id)
+                continue
+            try:
+                sha = snap_data.get('content_sha256')
+                text = texts.get(sha) if sha else None
+                if text is None:
+                    text = extract_text(archive.read_original(snapshot_id))
+                    texts = {sha: text} if sha else {}
+                self.add(snap_data, text)
+                added += 1
+                if added % 500 == 0:
+                    print(f"   📚 {added} pages indexées...")
+            except Exception as e:
+                print(f"❌ Erreur d'indexation {snapshot_id}: {e}")
+        for snapshot_id in stale:
+            self.remove(snapshot_id)
+        self.commit()
+        return added, len(stale)
+
+    def search(self, query, limit=20, raw=False):
+        """Captures les plus pertinentes pour une requête
+
+        Par défaut la requête est une saisie libre (tous les mots, en préfixe) ;
+        raw=True la passe telle quelle à FTS5 (OR, NEAR, "expression exacte"...).
+        Retourne [{snapshot_id, url, title, score, snippet}], du meilleur au moins bon.
+        """
+        match = query if raw else build_query(query)
+        if not match:
+            return []
+        rows = self.conn.execute(f"""
+            SELECT d.snapshot_id, pages.url, pages.title,
+                   bm25(pages, {', '.join(map(str, self.WEIGHTS))}) AS score,
+                   snippet(pages, 2, '[', ']', ' … ', 12)
+            FROM pages JOIN documents d ON d.doc_id = pages.rowid
+            WHERE pages MATCH ? ORDER BY score LIMIT ?
+        """, (match, limit)).fetchall()
+        # bm25 est négatif (plus petit = plus pertinent) : on l'inverse pour l'affichage
+        return [{'snapshot_id': r[0], 'url': r[1], 'title': r[2], 'score': round(-r[3], 3), 'snippet': r[4]}
+                for r in rows]
+
+    def commit(self):
+        self.conn.commit()
+        self.pending = 0
+
+    def close(self):
+        self.commit()
+        self.conn.close()
@@ -0,0 +1,71 @@
+"""Liens de la copie hors ligne d'une page : vers les captures de l'archive
+
+Les liens <a>/<area> de la page sont remplacés en une passe d'expressions
+régulières sur le HTML (sans reconstruire le document) : vers la capture locale
+de la page visée si elle existe, sinon vers assets/missing.html qui signale
+une page non capturée. L'URL d'origine reste dans data-archive-url.
+"""
+import html as html_lib
+import re
+from urllib.parse import quote, urljoin, urlsplit
+
+ANCHOR = re.compile(r'<(?:a|area)\b[^>]*>', re.I)
+HREF = re.compile(r'''(\shref\s*=\s*)("[^"]*"|'[^']*'|[^\s"'>]+)''', re.I)
+TARGET = re.compile(r'\starget\s*=', re.I)
+BASE = re.compile(r'''<base\b[^>]*?\shref\s*=\s*("[^"]*"|'[^']*'|[^\s"'>]+)[^>]*>''', re.I)
+# Page affichée pour un lien vers une URL sans capture (l'URL suit le #)
+MISSING_PAGE = "../assets/missing.html"
+
+
+def _attribute_value(raw):
+    if raw[:1] in '"\'' and raw[-1:] == raw[:1]:
+        raw = raw[1:-1]
+    return html_lib.unescape(raw).strip()
+
+
+def strip_base(html, url):
+    """Retire <base href> (les chemins locaux doivent rester relatifs à la capture)
+    et retourne (html, URL de base pour résoudre les liens de la page)"""
+    match = BASE.search(html)
+    if not match:
+        return html, url
+    return html[:match.start()] + html[match.end():], urljoin(url, _attribute_value(match.group(1)))
+
+
+def rewrite_links(html, base_url, locate):
+    """Fait pointer les liens de la page vers l'archive
+
+    locate(url absolue) retourne le chemin de sa capture relatif à la page, ou
+    None si elle n'a pas été capturée. Retourne (html, liens locaux, liens manquants).
+    """
+    counts = {'local': 0, 'missing': 0}
+
+    def anchor(match):
+        tag = match.group(0)
+        href = HREF.search(tag)
+        if not href:
+            return tag
+        value = _attribute_value(href.group(2))
+        if not value or value.startswith('#'):
+            return tag
+        url = urljoin(base_url, value)
+        if urlsplit(url).scheme not in ('http', 'https'):
+            return tag
+        local = locate(url.split('#')[0])
+        if local:
+            counts['local'] += 1
+            extra = ''
+        else:
+            counts['missing'] += 1
+            local = f"{MISSING_PAGE}#{quote(url, safe=':/?&=%#@+,;~')}"
+            extra = ' data-archive-missing=""'
+        extra += f' data-archive-url="{html_lib.escape(url)}"'
+        # Une capture s'ouvre avec son overlay, en pleine fenêtre et pas dans l'iframe
+        if not TARGET.search(tag):
+            extra += ' target="_top"'
+        start, end = href.span()
+        tag = f'{tag[:start]}{href.group(1)}"{html_lib.escape(local)}"{extra}{tag[end:]}'
+        return tag
+
+    html = ANCHOR.sub(anchor, html)
+    return html, counts['local'], counts['missing']
@@ -0,0 +1,226 @@
+"""Ressources des pages (CSS, images, scripts) pour consulter l'archive hors ligne
+
+Les ressources sont téléchargées en parallèle dans requisites/, rangées par
+empreinte SHA-256 : une feuille de style utilisée par 10 000 pages n'est
+téléchargée et stockée qu'une fois. requisites/index.jsonl garde la
+correspondance URL -> fichier d'un crawl à l'autre. Les URLs sont repérées et
+réécrites par expressions régulières, sans reconstruire le document.
+"""
+import html as html_lib
+import json
+import mimetypes
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+from urllib.parse import urljoin, urlsplit
+
+from storage import BlobStore
+
+# Balises qui chargent une ressource, et attributs qui portent son URL
+TAG = re.compile(r'<(img|script|link|source|video|audio|embed|input|track)\b[^>]*>', re.I)
+ATTRIBUTE = re.compile(r'''(\s(src|href|poster|srcset)\s*=\s*)("[^"]*"|'[^']*'|[^\s"'>]+)''', re.I)
+LINK_REL = re.compile(r'''\srel\s*=\s*["']?([^"'>]*)''', re.I)
+# <link rel=...> qui désignent une ressource de la page (pas une autre page)
+REQUISITE_RELS = {'stylesheet', 'icon', 'shortcut', 'apple-touch-icon', 'preload', 'modulepreload'}
+CSS_URL = re.compile(r'''url\(\s*("[^"]*"|'[^']*'|[^)'"\s]+)\s*\)''', re.I)
+CSS_IMPORT = re.compile(r'''@import\s+("[^"]*"|'[^']*')''', re.I)
+STYLE_BLOCK = re.compile(r'(<style\b[^>]*>)(.*?)(</style>)', re.I | re.S)
+STYLE_ATTRIBUTE = re.compile(r'''(\sstyle\s*=\s*)("[^"]*"|'[^']*')''', re.I)
+SKIPPED_SCHEMES = ('data:', 'javascript:', 'blob:', 'about:', 'mailto:', '#')
+# Profondeur des feuilles de style importées par d'autres feuilles de style
+MAX_CSS_DEPTH = 3
+
+
+def _unquote(value):
+    if value[:1] in '"\'' and value[-1:] == value[:1]:
+        return value[1:-1], value[0]
+    return value, ''
+
+
+def _resolve(value, base_url):
+    """URL absolue (sans fragment) d'une valeur d'attribut, ou None si ce n'est pas une ressource"""
+    value = html_lib.unescape(value).strip()
+    if not value or value.lower().startswith(SKIPPED_SCHEMES):
+        return None
+    url = urljoin(base_url, value).split('#')[0]
+    return url if urlsplit(url).scheme in ('http', 'https') else None
+
+
+def _rewrite_srcset(value, base_url, replace):
+    candidates = []
+    for candidate in value.split(','):
+        parts = candidate.strip().split(None, 1)
+        if not parts:
+            continue
+        url = _resolve(parts[0], base_url)
+        local = replace(url) if url else None
+        candidates.append(' '.join([local or parts[0]] + parts[1:]))
+    return ', '.join(candidates)
+
+
+def _rewrite_css(css, base_url, replace):
+    def url_match(match):
+        value, quote = _unquote(match.group(1))
+        url = _resolve(value, base_url)
+        local = replace(url) if url else None
+        return f"url({quote}{local}{quote})" if local else match.group(0)
+
+    def import_match(match):
+        value, quote = _unquote(match.group(1))
+        url = _resolve(value, base_url)
+        local = replace(url) if url else None
+        return f"@import {quote}{local}{quote}" if local else match.group(0)
+
+    return CSS_IMPORT.sub(import_match, CSS_URL.sub(url_match, css))
+
+
+def rewrite_html(html, base_url, replace):
+    """Remplace les URLs des ressources d'une page
+
+    replace(url absolue) retourne le chemin local à mettre à la place, ou None
+    pour laisser l'URL telle quelle. Sert aussi à collecter les URLs.
+    """
+    def attribute_match(match, tag):
+        name = match.group(2).lower()
+        if name == 'href' and tag != 'link':
+            return match.group(0)
+        value, quote = _unquote(match.group(3))
+        if name == 'srcset':
+            local = _rewrite_srcset(html_lib.unescape(value), base_url, replace)
+        else:
+            url = _resolve(value, base_url)
+            local = replace(url) if url else None
+        if not local:
+            return match.group(0)
+        quote = quote or '"'
+        return f"{match.group(1)}{quote}{html_lib.escape(local)}{quote}"
+
+    def tag_match(match):
+        tag = match.group(1).lower()
+        if tag == 'link':
+            rel = LINK_REL.search(match.group(0))
+            if not rel or not REQUISITE_RELS & set(rel.group(1).lower().split()):
+                return match.group(0)
+        return ATTRIBUTE.sub(lambda m: attribute_match(m, tag), match.group(0))
+
+    def style_block(match):
+        return match.group(1) + _rewrite_css(match.group(2), base_url, replace) + match.group(3)
+
+    def style_attribute(match):
+        value, quote = _unquote(match.group(2))
+        css = _rewrite_css(html_lib.unescape(value), base_url, replace)
+        return f"{match.group(1)}{quote}{html_lib.escape(css)}{quote}"
+
+    html = TAG.sub(tag_match, html)
+    html = STYLE_BLOCK.sub(style_block, html)
+    return STYLE_ATTRIBUTE.sub(style_attribute, html)
+
+
+def find_requisites(html, base_url):
+    """URLs absolues des ressources d'une page, dans l'ordre, sans doublons"""
+    urls = {}
+    rewrite_html(html, base_url, lambda url: urls.setdefault(url) or None)
+    return list(urls)
+
+
+class RequisiteCache:
+    """Ressources partagées par toutes les captures d'une archive
+
+    download(url) retourne (octets, type de contenu) ou lève une exception ;
+    il est appelé depuis les threads du cache.
+    """
+    def __init__(self, base_dir, download, workers=4):
+        self.root = base_dir / "requisites"
+        self.blobs = BlobStore(self.root)
+        self.root.mkdir(exist_ok=True)
+        self.index_file = self.root / "index.jsonl"
+        self.download = download
+        self.entries = {}  # url -> chemin relatif à l'archive
+        self.failed = set()
+        self.in_flight = {}  # url -> future
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="requisites")
+        self.downloaded = 0
+        self.reused = 0
+        self.load()
+
+    def load(self):
+        if not self.index_file.exists():
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if (self.root.parent / entry['path']).exists():
+                    self.entries[entry['url']] = entry['path']
+
+    def localize(self, urls):
+        """Télécharge en parallèle les ressources absentes du cache ; retourne {url: chemin}"""
+        mapping, futures = {}, {}
+        with self.lock:
+            for url in dict.fromkeys(urls):
+                if url in self.entries:
+                    mapping[url] = self.entries[url]
+                    self.reused += 1
+                elif url not in self.failed:
+                    if url not in self.in_flight:
+                        self.in_flight[url] = self.executor.submit(self._fetch, url)
+                    futures[url] = self.in_flight[url]
+        for url, future in futures.items():
+            path = future.result()
+            if path:
+                mapping[url] = path
+        return mapping
+
+    def _fetch(self, url, depth=0):
+        """Télécharge et stocke une ressource (thread du cache) ; retourne son chemin ou None"""
+        try:
+            data, content_type = self.download(url)
+            content_type = (content_type or '').split(';')[0].strip().lower()
+            if content_type == 'text/css' or (not content_type and url.lower().endswith('.css')):
+                data = self._localize_css(data, url, depth)
+            suffix = PurePosixPath(urlsplit(url).path).suffix.lower()
+            if not re.fullmatch(r'\.[a-z0-9]{1,5}', suffix):
+                suffix = mimetypes.guess_extension(content_type) or '' if content_type else ''
+            _, path = self.blobs.put(data, suffix=suffix)
+            relative = path.relative_to(self.root.parent).as_posix()
+            with self.lock:
+                self.entries[url] = relative
+                self.downloaded += 1
+                with open(self.index_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'url': url, 'path': relative, 'type': content_type,
+                                        'size': len(data)}, ensure_ascii=False) + '\n')
+            return relative
+        except Exception as e:
+            print(f"❌ Ressource non récupérée {url}: {e}")
+            with self.lock:
+                self.failed.add(url)
+            return None
+        finally:
+            with self.lock:
+                self.in_flight.pop(url, None)
+
+    def _localize_css(self, data, url, depth):
+        """Télécharge les images, polices et @import d'une feuille de style et la réécrit"""
+        try:
+            css, encoding = data.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            css, encoding = data.decode('latin-1'), 'latin-1'
+
+        def replace(sub_url):
+            with self.lock:
+                path = self.entries.get(sub_url)
+                if path is None and (sub_url in self.failed or depth >= MAX_CSS_DEPTH):
+                    return None
+            # Dans le thread courant : attendre un autre thread pourrait bloquer le pool
+            path = path or self._fetch(sub_url, depth + 1)
+            # Les feuilles de style sont dans requisites/xx/ : les autres fichiers sont à ../yy/
+            return '../' + path.split('/', 1)[1] if path else None
+
+        return _rewrite_css(css, url, replace).encode(encoding)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
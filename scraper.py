@@ -1,1316 +1,1398 @@
-import os
-import requests
-import time
-import hashlib
-import json
-from datetime import datetime
-from pathlib import Path
-from urllib.parse import urljoin, urlparse, urlencode
-from bs4 import BeautifulSoup
-
-class LocalSnapshot:
-    def __init__(self, base_dir="snapshots"):
-        self.base_dir = Path(base_dir)
-        self.base_dir.mkdir(exist_ok=True)
-        self.index_file = self.base_dir / "index.json"
-        self.snapshots = self.load_index()
-        
-    def load_index(self):
-        if self.index_file.exists():
-            with open(self.index_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
-    
-    def save_index(self):
-        with open(self.index_file, 'w', encoding='utf-8') as f:
-            json.dump(self.snapshots, f, indent=2, ensure_ascii=False)
-    
-    def create_snapshot_id(self, url):
-        """Crée un ID unique pour l'URL"""
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-        parsed = urlparse(url)
-        domain = parsed.netloc.replace('.', '_')
-        path = parsed.path.replace('/', '_')[:20] or 'root'
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"{domain}_{path}_{url_hash}_{timestamp}"
-    
-    def _generate_captured_links_html(self, links):
-        """Génère le HTML UNIQUEMENT pour les liens CAPTURÉS"""
-        html_parts = []
-        captured_links = []
-        
-        # Filtrer uniquement les liens capturés
-        for link in links:
-            # Vérifier si ce lien a été capturé
-            for snap_id, snap_data in self.snapshots.items():
-                if snap_data['url'] == link:
-                    captured_links.append({
-                        'url': link,
-                        'snapshot_id': snap_id,
-                        'title': snap_data.get('title', '')
-                    })
-                    break
-        
-        if not captured_links:
-            return '<div style="color: rgba(255,255,255,0.6); font-style: italic; padding: 20px; text-align: center;">Aucun lien capturé disponible</div>'
-        
-        for i, link_data in enumerate(captured_links[:50]):  # Limite à 50 liens capturés
-            link = link_data['url']
-            snapshot_id = link_data['snapshot_id']
-            truncated_link = link[:70] + "..." if len(link) > 70 else link
-            
-            # Déterminer l'icône selon le type de lien
-            icon = "fa-link"
-            if "lemonde.fr" in link:
-                icon = "fa-newspaper"
-            elif "youtube.com" in link or "vimeo.com" in link:
-                icon = "fa-video"
-            elif "github.com" in link:
-                icon = "fa-code-branch"
-            elif "twitter.com" in link or "facebook.com" in link:
-                icon = "fa-share-alt"
-            elif "reddit.com" in link:
-                icon = "fa-reddit"
-            elif "discord.com" in link or "discord.gg" in link:
-                icon = "fa-discord"
-            
-            html_parts.append(f'''
-            <div class="link-item captured">
-                <a href="../{snapshot_id}/index.html" 
-                   class="link-url" 
-                   target="_blank"
-                   title="{link}">
-                   <i class="fab {icon}"></i>
-                   {truncated_link}
-                </a>
-                <div class="link-status">
-                    <span class="status-badge status-captured">
-                        {i+1}. ✅ Disponible
-                    </span>
-                    <a href="../{snapshot_id}/original.html" target="_blank" style="color: #4cc9f0; font-size: 12px;">
-                        <i class="fas fa-external-link-alt"></i>
-                    </a>
-                </div>
-            </div>
-            ''')
-        
-        return ''.join(html_parts)
-    
-    def save_html_snapshot(self, url, html, links, title=""):
-        """Sauvegarde une capture HTML et crée une version navigable"""
-        snapshot_id = self.create_snapshot_id(url)
-        snapshot_dir = self.base_dir / snapshot_id
-        snapshot_dir.mkdir(exist_ok=True)
-        
-        # Fichier HTML original
-        original_file = snapshot_dir / "original.html"
-        with open(original_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        # Créer une version modifiée avec navigation
-        self.create_navigable_html(url, html, links, snapshot_id)
-        
-        # Sauvegarder les métadonnées
-        self.snapshots[snapshot_id] = {
-            'url': url,
-            'title': title[:100] if title else url,
-            'timestamp': datetime.now().isoformat(),
-            'snapshot_id': snapshot_id,
-            'path': f"{snapshot_id}/index.html",
-            'links_found': len(links),
-            'links_available': list(links),
-            'domain': urlparse(url).netloc
-        }
-        
-        self.save_index()
-        return snapshot_id
-    
-    def update_captured_links(self):
-        """Met à jour la liste des liens capturés pour chaque snapshot"""
-        for snap_id, snap_data in self.snapshots.items():
-            captured_links = []
-            
-            # Vérifie quels liens de cette page ont été capturés
-            for link in snap_data.get('links_available', []):
-                # Cherche si ce lien a été capturé
-                for other_snap in self.snapshots.values():
-                    if other_snap['url'] == link:
-                        captured_links.append({
-                            'url': link,
-                            'snapshot_id': other_snap['snapshot_id'],
-                            'title': other_snap.get('title', ''),
-                            'domain': urlparse(link).netloc
-                        })
-                        break
-            
-            # Met à jour les données
-            snap_data['links_captured'] = captured_links
-            snap_data['links_captured_count'] = len(captured_links)
-        
-        self.save_index()
-    
-    def create_navigable_html(self, url, html, links, snapshot_id):
-        """Crée une version HTML avec navigation élégante et interactive"""
-        # Récupérer le titre de la page
-        soup_temp = BeautifulSoup(html, 'html.parser')
-        page_title = soup_temp.title.string if soup_temp.title else url
-        truncated_title = page_title[:60] + "..." if len(page_title) > 60 else page_title
-        
-        # Compter les liens capturés
-        captured_count = 0
-        for link in links:
-            for snap_data in self.snapshots.values():
-                if snap_data['url'] == link:
-                    captured_count += 1
-                    break
-        
-        # Créer l'overlay moderne
-        overlay_html = f'''
-        <!DOCTYPE html>
-        <html lang="fr">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Snapshot: {truncated_title}</title>
-            <style>
-                :root {{
-                    --primary-color: #4361ee;
-                    --secondary-color: #3a0ca3;
-                    --accent-color: #4cc9f0;
-                    --success-color: #4ade80;
-                    --warning-color: #f59e0b;
-                    --danger-color: #ef4444;
-                    --dark-bg: #1e293b;
-                    --light-bg: #f8fafc;
-                    --card-bg: #ffffff;
-                    --text-dark: #1e293b;
-                    --text-light: #64748b;
-                    --shadow: 0 10px 25px rgba(0, 0, 0, 0.1);
-                    --radius: 12px;
-                    --transition: all 0.3s ease;
-                }}
-                
-                * {{
-                    margin: 0;
-                    padding: 0;
-                    box-sizing: border-box;
-                }}
-                
-                body {{
-                    font-family: 'Inter', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh;
-                    padding: 20px;
-                }}
-                
-                .snapshot-container {{
-                    max-width: 1400px;
-                    margin: 0 auto;
-                    background: var(--card-bg);
-                    border-radius: var(--radius);
-                    box-shadow: var(--shadow);
-                    overflow: hidden;
-                    display: grid;
-                    grid-template-columns: 300px 1fr;
-                    min-height: 95vh;
-                }}
-                
-                /* Sidebar Navigation */
-                .sidebar {{
-                    background: linear-gradient(135deg, var(--dark-bg) 0%, #2d3748 100%);
-                    color: white;
-                    padding: 30px 20px;
-                    display: flex;
-                    flex-direction: column;
-                }}
-                
-                .logo {{
-                    display: flex;
-                    align-items: center;
-                    gap: 10px;
-                    margin-bottom: 30px;
-                    padding-bottom: 20px;
-                    border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-                }}
-                
-                .logo-icon {{
-                    width: 40px;
-                    height: 40px;
-                    background: linear-gradient(135deg, var(--accent-color), var(--primary-color));
-                    border-radius: 10px;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    font-size: 20px;
-                }}
-                
-                .logo-text {{
-                    font-size: 18px;
-                    font-weight: 700;
-                    background: linear-gradient(135deg, var(--accent-color), white);
-                    -webkit-background-clip: text;
-                    -webkit-text-fill-color: transparent;
-                }}
-                
-                .snapshot-info {{
-                    margin-bottom: 30px;
-                }}
-                
-                .info-card {{
-                    background: rgba(255, 255, 255, 0.05);
-                    border-radius: 10px;
-                    padding: 15px;
-                    margin-bottom: 15px;
-                }}
-                
-                .info-label {{
-                    font-size: 12px;
-                    color: var(--accent-color);
-                    text-transform: uppercase;
-                    letter-spacing: 0.5px;
-                    margin-bottom: 5px;
-                }}
-                
-                .info-value {{
-                    font-size: 14px;
-                    font-weight: 500;
-                    word-break: break-word;
-                }}
-                
-                .stats {{
-                    display: grid;
-                    grid-template-columns: 1fr 1fr;
-                    gap: 10px;
-                    margin-bottom: 30px;
-                }}
-                
-                .stat-item {{
-                    text-align: center;
-                    padding: 10px;
-                    background: rgba(255, 255, 255, 0.05);
-                    border-radius: 8px;
-                }}
-                
-                .stat-number {{
-                    font-size: 24px;
-                    font-weight: 700;
-                    color: var(--accent-color);
-                }}
-                
-                .stat-label {{
-                    font-size: 11px;
-                    color: rgba(255, 255, 255, 0.6);
-                    text-transform: uppercase;
-                    letter-spacing: 0.5px;
-                }}
-                
-                /* Links Panel */
-                .links-panel {{
-                    flex: 1;
-                    display: flex;
-                    flex-direction: column;
-                }}
-                
-                .panel-title {{
-                    display: flex;
-                    align-items: center;
-                    gap: 10px;
-                    margin-bottom: 15px;
-                    color: white;
-                    font-size: 16px;
-                    font-weight: 600;
-                }}
-                
-                .links-search {{
-                    width: 100%;
-                    padding: 10px 15px;
-                    background: rgba(255, 255, 255, 0.1);
-                    border: 1px solid rgba(255, 255, 255, 0.2);
-                    border-radius: 8px;
-                    color: white;
-                    margin-bottom: 15px;
-                    font-size: 14px;
-                }}
-                
-                .links-search::placeholder {{
-                    color: rgba(255, 255, 255, 0.5);
-                }}
-                
-                .links-list {{
-                    flex: 1;
-                    overflow-y: auto;
-                    padding-right: 5px;
-                }}
-                
-                .link-item {{
-                    background: rgba(255, 255, 255, 0.05);
-                    border-radius: 8px;
-                    padding: 12px;
-                    margin-bottom: 10px;
-                    border-left: 3px solid var(--success-color);
-                    transition: var(--transition);
-                }}
-                
-                .link-item:hover {{
-                    background: rgba(255, 255, 255, 0.1);
-                    transform: translateX(5px);
-                }}
-                
-                .link-url {{
-                    display: block;
-                    color: white;
-                    text-decoration: none;
-                    font-size: 13px;
-                    line-height: 1.4;
-                    margin-bottom: 5px;
-                    word-break: break-all;
-                }}
-                
-                .link-url:hover {{
-                    color: var(--accent-color);
-                }}
-                
-                .link-status {{
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }}
-                
-                .status-badge {{
-                    font-size: 11px;
-                    padding: 3px 8px;
-                    border-radius: 12px;
-                    font-weight: 600;
-                }}
-                
-                .status-captured {{
-                    background: rgba(76, 217, 100, 0.2);
-                    color: var(--success-color);
-                }}
-                
-                /* Main Content */
-                .main-content {{
-                    display: flex;
-                    flex-direction: column;
-                }}
-                
-                .content-header {{
-                    background: white;
-                    padding: 25px 30px;
-                    border-bottom: 1px solid #e2e8f0;
-                    box-shadow: 0 2px 10px rgba(0, 0, 0, 0.05);
-                }}
-                
-                .breadcrumb {{
-                    display: flex;
-                    align-items: center;
-                    gap: 10px;
-                    font-size: 14px;
-                    color: var(--text-light);
-                    margin-bottom: 15px;
-                }}
-                
-                .breadcrumb a {{
-                    color: var(--primary-color);
-                    text-decoration: none;
-                }}
-                
-                .page-title {{
-                    font-size: 24px;
-                    font-weight: 700;
-                    color: var(--text-dark);
-                    margin-bottom: 10px;
-                    line-height: 1.3;
-                }}
-                
-                .page-meta {{
-                    display: flex;
-                    gap: 20px;
-                    font-size: 14px;
-                    color: var(--text-light);
-                }}
-                
-                .meta-item {{
-                    display: flex;
-                    align-items: center;
-                    gap: 5px;
-                }}
-                
-                .action-buttons {{
-                    display: flex;
-                    gap: 10px;
-                    margin-top: 20px;
-                }}
-                
-                .btn {{
-                    padding: 10px 20px;
-                    border-radius: 8px;
-                    text-decoration: none;
-                    font-weight: 600;
-                    font-size: 14px;
-                    display: inline-flex;
-                    align-items: center;
-                    gap: 8px;
-                    transition: var(--transition);
-                }}
-                
-                .btn-primary {{
-                    background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
-                    color: white;
-                    border: none;
-                }}
-                
-                .btn-primary:hover {{
-                    transform: translateY(-2px);
-                    box-shadow: 0 5px 15px rgba(67, 97, 238, 0.3);
-                }}
-                
-                .btn-secondary {{
-                    background: var(--light-bg);
-                    color: var(--text-dark);
-                    border: 1px solid #e2e8f0;
-                }}
-                
-                .btn-secondary:hover {{
-                    background: #f1f5f9;
-                }}
-                
-                /* Iframe Container */
-                .iframe-container {{
-                    flex: 1;
-                    position: relative;
-                    padding: 20px;
-                }}
-                
-                .iframe-wrapper {{
-                    width: 100%;
-                    height: 100%;
-                    border-radius: 10px;
-                    overflow: hidden;
-                    box-shadow: var(--shadow);
-                    background: white;
-                }}
-                
-                #page-frame {{
-                    width: 100%;
-                    height: 100%;
-                    border: none;
-                    border-radius: 10px;
-                }}
-                
-                .loading-overlay {{
-                    position: absolute;
-                    top: 0;
-                    left: 0;
-                    right: 0;
-                    bottom: 0;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                    justify-content: center;
-                    color: white;
-                    border-radius: 10px;
-                    z-index: 10;
-                    opacity: 0;
-                    animation: fadeIn 0.5s ease forwards;
-                }}
-                
-                .spinner {{
-                    width: 50px;
-                    height: 50px;
-                    border: 3px solid rgba(255, 255, 255, 0.3);
-                    border-radius: 50%;
-                    border-top-color: white;
-                    animation: spin 1s ease-in-out infinite;
-                    margin-bottom: 20px;
-                }}
-                
-                @keyframes spin {{
-                    to {{ transform: rotate(360deg); }}
-                }}
-                
-                @keyframes fadeIn {{
-                    from {{ opacity: 0; }}
-                    to {{ opacity: 1; }}
-                }}
-                
-                /* Responsive */
-                @media (max-width: 1024px) {{
-                    .snapshot-container {{
-                        grid-template-columns: 1fr;
-                    }}
-                    
-                    .sidebar {{
-                        max-height: 400px;
-                    }}
-                }}
-                
-                /* Custom scrollbar */
-                ::-webkit-scrollbar {{
-                    width: 8px;
-                }}
-                
-                ::-webkit-scrollbar-track {{
-                    background: rgba(255, 255, 255, 0.1);
-                    border-radius: 4px;
-                }}
-                
-                ::-webkit-scrollbar-thumb {{
-                    background: rgba(255, 255, 255, 0.3);
-                    border-radius: 4px;
-                }}
-                
-                ::-webkit-scrollbar-thumb:hover {{
-                    background: rgba(255, 255, 255, 0.5);
-                }}
-                
-                .no-links-message {{
-                    color: rgba(255, 255, 255, 0.6);
-                    font-style: italic;
-                    padding: 20px;
-                    text-align: center;
-                    font-size: 14px;
-                }}
-            </style>
-            <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-            <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.4/css/all.min.css">
-        </head>
-        <body>
-            <div class="snapshot-container">
-                <!-- Sidebar Navigation -->
-                <div class="sidebar">
-                    <div class="logo">
-                        <div class="logo-icon">
-                            <i class="fas fa-archive"></i>
-                        </div>
-                        <div class="logo-text">Wayback Local</div>
-                    </div>
-                    
-                    <div class="snapshot-info">
-                        <div class="info-card">
-                            <div class="info-label">Snapshot ID</div>
-                            <div class="info-value">{snapshot_id}</div>
-                        </div>
-                        <div class="info-card">
-                            <div class="info-label">URL</div>
-                            <div class="info-value">{url[:80]}{'...' if len(url) > 80 else ''}</div>
-                        </div>
-                    </div>
-                    
-                    <div class="stats">
-                        <div class="stat-item">
-                            <div class="stat-number">{len(links)}</div>
-                            <div class="stat-label">Liens trouvés</div>
-                        </div>
-                        <div class="stat-item">
-                            <div class="stat-number">{captured_count}</div>
-                            <div class="stat-label">Liens capturés</div>
-                        </div>
-                    </div>
-                    
-                    <div class="links-panel">
-                        <div class="panel-title">
-                            <i class="fas fa-link"></i>
-                            <span>Liens disponibles ({captured_count})</span>
-                        </div>
-                        
-                        {f'<input type="text" class="links-search" placeholder="Rechercher un lien..." onkeyup="filterLinks()">' if captured_count > 0 else ''}
-                        
-                        <div class="links-list" id="links-list">
-                            {self._generate_captured_links_html(links)}
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Main Content -->
-                <div class="main-content">
-                    <div class="content-header">
-                        <div class="breadcrumb">
-                            <a href="../../index.html"><i class="fas fa-home"></i> Index</a>
-                            <i class="fas fa-chevron-right"></i>
-                            <span>{urlparse(url).netloc}</span>
-                        </div>
-                        
-                        <h1 class="page-title">{truncated_title}</h1>
-                        
-                        <div class="page-meta">
-                            <div class="meta-item">
-                                <i class="fas fa-globe"></i>
-                                <span>{urlparse(url).netloc}</span>
-                            </div>
-                            <div class="meta-item">
-                                <i class="fas fa-calendar"></i>
-                                <span>{datetime.now().strftime('%d/%m/%Y %H:%M')}</span>
-                            </div>
-                            <div class="meta-item">
-                                <i class="fas fa-database"></i>
-                                <span>{len(html)//1024} KB</span>
-                            </div>
-                        </div>
-                        
-                        <div class="action-buttons">
-                            <a href="original.html" target="_blank" class="btn btn-primary">
-                                <i class="fas fa-file-code"></i>
-                                Voir le HTML original
-                            </a>
-                            <a href="../../index.html" class="btn btn-secondary">
-                                <i class="fas fa-list"></i>
-                                Retour à l'index
-                            </a>
-                        </div>
-                    </div>
-                    
-                    <div class="iframe-container">
-                        <div class="iframe-wrapper">
-                            <div class="loading-overlay">
-                                <div class="spinner"></div>
-                                <p>Chargement de la capture...</p>
-                            </div>
-                            <iframe id="page-frame" src="original.html"></iframe>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <script>
-                // Filtre des liens
-                function filterLinks() {{
-                    const searchTerm = document.querySelector('.links-search').value.toLowerCase();
-                    const links = document.querySelectorAll('.link-item');
-                    
-                    let visibleCount = 0;
-                    links.forEach(link => {{
-                        const url = link.querySelector('.link-url').textContent.toLowerCase();
-                        if (url.includes(searchTerm)) {{
-                            link.style.display = 'block';
-                            visibleCount++;
-                        }} else {{
-                            link.style.display = 'none';
-                        }}
-                    }});
-                    
-                    // Mettre à jour le titre avec le nombre de résultats
-                    const panelTitle = document.querySelector('.panel-title span');
-                    if (panelTitle) {{
-                        panelTitle.textContent = `Liens disponibles (${{visibleCount}})`;
-                    }}
-                }}
-                
-                // Masquer le loading overlay quand l'iframe est chargée
-                document.getElementById('page-frame').onload = function() {{
-                    document.querySelector('.loading-overlay').style.opacity = '0';
-                    setTimeout(() => {{
-                        document.querySelector('.loading-overlay').style.display = 'none';
-                    }}, 500);
-                }};
-                
-                // Initialiser
-                document.addEventListener('DOMContentLoaded', () => {{
-                    // Ajouter un effet de hover sur les liens
-                    document.querySelectorAll('.link-item').forEach(item => {{
-                        item.addEventListener('click', function(e) {{
-                            if (!e.target.classList.contains('link-url')) return;
-                            
-                            // Animation de sélection
-                            document.querySelectorAll('.link-item').forEach(i => {{
-                                i.style.background = '';
-                            }});
-                            this.style.background = 'rgba(255, 255, 255, 0.15)';
-                        }});
-                    }});
-                }});
-            </script>
-        </body>
-        </html>
-        '''
-        
-        # Sauvegarder l'overlay
-        overlay_file = self.base_dir / snapshot_id / "index.html"
-        with open(overlay_file, 'w', encoding='utf-8') as f:
-            f.write(overlay_html)
-        
-        return snapshot_id
-    
-    def generate_index_page(self):
-        """Génère une page d'index pour naviguer entre toutes les captures"""
-        
-        # Met à jour les liens capturés avant de générer l'index
-        self.update_captured_links()
-        
-        # Calculer les statistiques globales
-        total_snapshots = len(self.snapshots)
-        domains = set(s['domain'] for s in self.snapshots.values())
-        total_links_found = sum(s.get('links_found', 0) for s in self.snapshots.values())
-        total_links_captured = sum(s.get('links_captured_count', 0) for s in self.snapshots.values())
-        coverage = round((total_links_captured / total_links_found * 100)) if total_links_found > 0 else 0
-        
-        html = f'''
-        <!DOCTYPE html>
-        <html lang="fr">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Wayback Machine Local - Index des captures</title>
-            <style>
-                * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh;
-                    padding: 20px;
-                }}
-                .container {{
-                    max-width: 1400px;
-                    margin: 0 auto;
-                    background: white;
-                    border-radius: 15px;
-                    box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-                    overflow: hidden;
-                }}
-                header {{
-                    background: linear-gradient(135deg, #2c3e50, #4a6491);
-                    color: white;
-                    padding: 40px;
-                    text-align: center;
-                }}
-                h1 {{
-                    font-size: 2.5em;
-                    margin-bottom: 10px;
-                }}
-                .stats {{
-                    display: flex;
-                    justify-content: center;
-                    gap: 30px;
-                    margin-top: 20px;
-                    flex-wrap: wrap;
-                }}
-                .stat-box {{
-                    background: rgba(255,255,255,0.1);
-                    padding: 15px 25px;
-                    border-radius: 10px;
-                    backdrop-filter: blur(10px);
-                    min-width: 180px;
-                }}
-                .stat-number {{
-                    font-size: 2em;
-                    font-weight: bold;
-                    display: block;
-                }}
-                .stat-label {{
-                    font-size: 0.9em;
-                    opacity: 0.9;
-                }}
-                .content {{
-                    padding: 30px;
-                }}
-                .filters {{
-                    display: flex;
-                    gap: 15px;
-                    margin-bottom: 30px;
-                    flex-wrap: wrap;
-                }}
-                input, select {{
-                    padding: 12px 20px;
-                    border: 2px solid #ddd;
-                    border-radius: 8px;
-                    font-size: 16px;
-                    flex: 1;
-                    min-width: 200px;
-                }}
-                .snapshot-grid {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fill, minmax(380px, 1fr));
-                    gap: 25px;
-                    margin-top: 20px;
-                }}
-                .snapshot-card {{
-                    background: white;
-                    border-radius: 10px;
-                    overflow: hidden;
-                    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-                    transition: transform 0.3s, box-shadow 0.3s;
-                    border: 1px solid #e0e0e0;
-                }}
-                .snapshot-card:hover {{
-                    transform: translateY(-5px);
-                    box-shadow: 0 15px 30px rgba(0,0,0,0.2);
-                }}
-                .card-header {{
-                    background: linear-gradient(135deg, #3498db, #2980b9);
-                    color: white;
-                    padding: 20px;
-                    position: relative;
-                }}
-                .card-body {{
-                    padding: 20px;
-                }}
-                .card-footer {{
-                    background: #f8f9fa;
-                    padding: 15px 20px;
-                    border-top: 1px solid #eee;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }}
-                .btn {{
-                    padding: 8px 16px;
-                    border-radius: 5px;
-                    text-decoration: none;
-                    font-weight: bold;
-                    transition: all 0.3s;
-                    font-size: 14px;
-                }}
-                .btn-view {{
-                    background: #27ae60;
-                    color: white;
-                }}
-                .btn-view:hover {{
-                    background: #219653;
-                }}
-                .btn-original {{
-                    background: #e74c3c;
-                    color: white;
-                }}
-                .btn-original:hover {{
-                    background: #c0392b;
-                }}
-                .btn-links {{
-                    background: #9b59b6;
-                    color: white;
-                    margin-left: 10px;
-                }}
-                .btn-links:hover {{
-                    background: #8e44ad;
-                }}
-                .timestamp {{
-                    color: rgba(255,255,255,0.8);
-                    font-size: 12px;
-                    margin-top: 5px;
-                }}
-                .url {{
-                    color: #2c3e50;
-                    font-weight: bold;
-                    margin: 10px 0;
-                    word-break: break-all;
-                    font-size: 14px;
-                }}
-                .domain-badge {{
-                    display: inline-block;
-                    background: #9b59b6;
-                    color: white;
-                    padding: 4px 8px;
-                    border-radius: 4px;
-                    font-size: 12px;
-                    margin-right: 5px;
-                }}
-                .link-stats {{
-                    display: flex;
-                    gap: 15px;
-                    margin: 10px 0;
-                    font-size: 13px;
-                }}
-                .link-stat {{
-                    display: flex;
-                    align-items: center;
-                    gap: 5px;
-                    padding: 5px 10px;
-                    background: #f1f5f9;
-                    border-radius: 5px;
-                }}
-                .link-stat.captured {{
-                    background: #d1fae5;
-                    color: #065f46;
-                }}
-                .link-stat.available {{
-                    background: #dbeafe;
-                    color: #1e40af;
-                }}
-                .link-stat.coverage {{
-                    background: #fef3c7;
-                    color: #92400e;
-                }}
-                .link-stat i {{
-                    font-size: 14px;
-                }}
-                .links-preview {{
-                    margin-top: 10px;
-                    max-height: 100px;
-                    overflow-y: auto;
-                    border: 1px solid #e5e7eb;
-                    border-radius: 5px;
-                    padding: 10px;
-                    background: #f9fafb;
-                    font-size: 12px;
-                }}
-                .link-preview-item {{
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                    padding: 3px 0;
-                    border-bottom: 1px solid #e5e7eb;
-                }}
-                .link-preview-item:last-child {{
-                    border-bottom: none;
-                }}
-                .link-status-dot {{
-                    width: 8px;
-                    height: 8px;
-                    border-radius: 50%;
-                    display: inline-block;
-                    margin-right: 5px;
-                }}
-                .link-status-dot.captured {{
-                    background: #10b981;
-                }}
-                @media (max-width: 768px) {{
-                    .snapshot-grid {{
-                        grid-template-columns: 1fr;
-                    }}
-                    .filters {{
-                        flex-direction: column;
-                    }}
-                    .stats {{
-                        gap: 15px;
-                    }}
-                    .stat-box {{
-                        min-width: 140px;
-                    }}
-                }}
-            </style>
-            <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-        </head>
-        <body>
-            <div class="container">
-                <header>
-                    <h1>🌐 Wayback Machine Local</h1>
-                    <p>Naviguez dans vos captures web locales</p>
-                    <div class="stats">
-                        <div class="stat-box">
-                            <span class="stat-number">{total_snapshots}</span>
-                            <span class="stat-label">📊 Captures totales</span>
-                        </div>
-                        <div class="stat-box">
-                            <span class="stat-number">{len(domains)}</span>
-                            <span class="stat-label">🌍 Domaines</span>
-                        </div>
-                        <div class="stat-box">
-                            <span class="stat-number">{total_links_captured}</span>
-                            <span class="stat-label">🔗 Liens internes</span>
-                        </div>
-                        <div class="stat-box">
-                            <span class="stat-number">{coverage}%</span>
-                            <span class="stat-label">🎯 Couverture</span>
-                        </div>
-                    </div>
-                </header>
-                
-                <div class="content">
-                    <div class="filters">
-                        <input type="text" id="search" placeholder="🔍 Rechercher une URL ou un titre..." onkeyup="filterSnapshots()">
-                        <select id="domain-filter" onchange="filterSnapshots()">
-                            <option value="">🌍 Tous les domaines</option>
-                        </select>
-                        <select id="sort" onchange="filterSnapshots()">
-                            <option value="newest">⬇️ Plus récent</option>
-                            <option value="oldest">⬆️ Plus ancien</option>
-                            <option value="domain">🌍 Par domaine</option>
-                            <option value="links">🔗 Plus de liens</option>
-                        </select>
-                    </div>
-                    
-                    <div id="snapshot-container" class="snapshot-grid">
-                        <!-- Les cartes seront générées ici par JavaScript -->
-                    </div>
-                </div>
-            </div>
-            
-            <script>
-                const snapshots = {json.dumps(list(self.snapshots.values()), ensure_ascii=False)};
-                
-                function filterSnapshots() {{
-                    const search = document.getElementById('search').value.toLowerCase();
-                    const domain = document.getElementById('domain-filter').value;
-                    const sort = document.getElementById('sort').value;
-                    
-                    let filtered = snapshots.filter(s => {{
-                        const matchesSearch = s.url.toLowerCase().includes(search) || 
-                                              (s.title && s.title.toLowerCase().includes(search)) ||
-                                              s.snapshot_id.toLowerCase().includes(search);
-                        const matchesDomain = !domain || s.domain === domain;
-                        return matchesSearch && matchesDomain;
-                    }});
-                    
-                    // Trier
-                    if (sort === 'newest') {{
-                        filtered.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
-                    }} else if (sort === 'oldest') {{
-                        filtered.sort((a, b) => new Date(a.timestamp) - new Date(b.timestamp));
-                    }} else if (sort === 'domain') {{
-                        filtered.sort((a, b) => a.domain.localeCompare(b.domain));
-                    }} else if (sort === 'links') {{
-                        filtered.sort((a, b) => (b.links_captured_count || 0) - (a.links_captured_count || 0));
-                    }}
-                    
-                    renderSnapshots(filtered);
-                }}
-                
-                function renderSnapshots(snapshots) {{
-                    const container = document.getElementById('snapshot-container');
-                    container.innerHTML = '';
-                    
-                    snapshots.forEach(snap => {{
-                        const date = new Date(snap.timestamp);
-                        const capturedCount = snap.links_captured_count || 0;
-                        const totalLinks = snap.links_found || 0;
-                        const coverage = totalLinks > 0 ? Math.round((capturedCount / totalLinks) * 100) : 0;
-                        
-                        // Préparer la preview des liens
-                        let linksPreview = '';
-                        if (snap.links_captured && snap.links_captured.length > 0) {{
-                            linksPreview = '<div class="links-preview">';
-                            snap.links_captured.slice(0, 3).forEach(link => {{
-                                const truncated = link.url.length > 50 ? link.url.substring(0, 50) + '...' : link.url;
-                                linksPreview += `
-                                    <div class="link-preview-item">
-                                        <span><span class="link-status-dot captured"></span>${{truncated}}</span>
-                                        <a href="${{link.snapshot_id}}/index.html" target="_blank" style="color: #3b82f6; font-size: 10px;">
-                                            <i class="fas fa-external-link-alt"></i>
-                                        </a>
-                                    </div>
-                                `;
-                            }});
-                            if (snap.links_captured.length > 3) {{
-                                linksPreview += `<div style="text-align: center; color: #6b7280; font-size: 11px; padding: 5px;">
-                                    + ${{snap.links_captured.length - 3}} autres liens...
-                                </div>`;
-                            }}
-                            linksPreview += '</div>';
-                        }}
-                        
-                        const card = `
-                            <div class="snapshot-card">
-                                <div class="card-header">
-                                    <span class="domain-badge">${{snap.domain}}</span>
-                                    <div class="timestamp">${{date.toLocaleString('fr-FR')}}</div>
-                                </div>
-                                <div class="card-body">
-                                    <div class="url" title="${{snap.url}}">
-                                        ${{snap.url.length > 60 ? snap.url.substring(0, 60) + '...' : snap.url}}
-                                    </div>
-                                    
-                                    <div class="link-stats">
-                                        <div class="link-stat captured">
-                                            <i class="fas fa-link"></i>
-                                            <span>${{capturedCount}} capturés</span>
-                                        </div>
-                                        <div class="link-stat available">
-                                            <i class="fas fa-external-link-alt"></i>
-                                            <span>${{totalLinks}} trouvés</span>
-                                        </div>
-                                        ${{coverage > 0 ? `
-                                        <div class="link-stat coverage">
-                                            <i class="fas fa-chart-line"></i>
-                                            <span>${{coverage}}% couverture</span>
-                                        </div>` : ''}}
-                                    </div>
-                                    
-                                    ${{linksPreview}}
-                                    
-                                    <div style="font-size: 12px; color: #7f8c8d; margin-top: 10px;">
-                                        ID: ${{snap.snapshot_id}}
-                                    </div>
-                                </div>
-                                <div class="card-footer">
-                                    <div>
-                                        <a href="${{snap.path}}" class="btn btn-view" target="_blank">
-                                            <i class="fas fa-eye"></i> Voir
-                                        </a>
-                                        <a href="${{snap.path.replace('index.html', 'original.html')}}" 
-                                           class="btn btn-original" target="_blank">
-                                            <i class="fas fa-code"></i> Original
-                                        </a>
-                                        ${{capturedCount > 0 ? `
-                                        <a href="${{snap.path}}" class="btn btn-links" target="_blank">
-                                            <i class="fas fa-sitemap"></i> Liens (${{capturedCount}})
-                                        </a>` : ''}}
-                                    </div>
-                                </div>
-                            </div>
-                        `;
-                        container.innerHTML += card;
-                    }});
-                    
-                    // Mettre à jour les options de filtre de domaine
-                    const domainSelect = document.getElementById('domain-filter');
-                    const domains = [...new Set(snapshots.map(s => s.domain))];
-                    
-                    // Réinitialiser les options (garder la première)
-                    while (domainSelect.options.length > 1) {{
-                        domainSelect.remove(1);
-                    }}
-                    
-                    domains.sort().forEach(domain => {{
-                        const option = document.createElement('option');
-                        option.value = domain;
-                        option.textContent = domain;
-                        domainSelect.appendChild(option);
-                    }});
-                }}
-                
-                // Initialisation
-                document.addEventListener('DOMContentLoaded', () => {{
-                    filterSnapshots();
-                }});
-            </script>
-        </body>
-        </html>
-        '''
-        
-        index_file = self.base_dir / "index.html"
-        with open(index_file, 'w', encoding='utf-8') as f:
-            f.write(html)
-        
-        print(f"✅ Index généré: {index_file}")
-        return str(index_file)
-
-class WebScraperWithSnapshots:
-    def __init__(self, base_dir="snapshots", delay=1, max_depth=3, max_pages=100):
-        self.snapshot = LocalSnapshot(base_dir)
-        self.visited = set()
-        self.delay = delay
-        self.max_depth = max_depth
-        self.max_pages = max_pages
-        self.pages_scraped = 0
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-    
-    def fetch_html(self, url):
-        """Récupère le contenu HTML d'une URL"""
-        try:
-            time.sleep(self.delay)
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            response.encoding = response.apparent_encoding
-            return response.text
-        except Exception as e:
-            print(f"❌ Erreur lors du fetch {url}: {e}")
-            return None
-    
-    def extract_links(self, html, base_url):
-        """Extrait tous les liens d'une page HTML"""
-        soup = BeautifulSoup(html, 'html.parser')
-        links = set()
-        
-        for tag in soup.find_all(['a', 'link'], href=True):
-            href = tag['href']
-            abs_url = urljoin(base_url, href)
-            if urlparse(abs_url).scheme in ['http', 'https']:
-                links.add(abs_url)
-        
-        return links
-    
-    def scrape_page(self, url, depth):
-        """Scrape une page unique et crée une capture"""
-        if (depth > self.max_depth or 
-            url in self.visited or 
-            self.pages_scraped >= self.max_pages):
-            return set()
-        
-        print(f"📥 Scraping (niveau {depth}): {url}")
-        
-        html = self.fetch_html(url)
-        if not html:
-            return set()
-        
-        self.visited.add(url)
-        self.pages_scraped += 1
-        
-        # Extraire les liens
-        links = self.extract_links(html, url)
-        print(f"   🔗 Trouvé {len(links)} liens")
-        
-        # Extraire le titre de la page
-        soup = BeautifulSoup(html, 'html.parser')
-        title = soup.title.string if soup.title else url
-        
-        # Créer la capture
-        snapshot_id = self.snapshot.save_html_snapshot(url, html, links, title)
-        print(f"   💾 Capture créée: {snapshot_id}")
-        
-        return links
-    
-    def crawl(self, start_url):
-        """Lance le crawling récursif"""
-        print(f"🚀 Démarrage du crawling depuis: {start_url}")
-        print(f"⚙️  Configuration: profondeur={self.max_depth}, délai={self.delay}s, max={self.max_pages} pages")
-        print("=" * 60)
-        
-        to_visit = [(start_url, 0)]
-        
-        while to_visit and self.pages_scraped < self.max_pages:
-            url, depth = to_visit.pop(0)
-            
-            if url not in self.visited and depth <= self.max_depth:
-                new_links = self.scrape_page(url, depth)
-                
-                # Ajouter les nouveaux liens à visiter
-                for link in new_links:
-                    if link not in self.visited:
-                        to_visit.append((link, depth + 1))
-        
-        # Générer l'index final
-        index_path = self.snapshot.generate_index_page()
-        print("=" * 60)
-        print(f"✅ Crawling terminé!")
-        print(f"📊 Statistiques:")
-        print(f"   Pages visitées: {len(self.visited)}")
-        print(f"   Captures créées: {len(self.snapshot.snapshots)}")
-        print(f"   Liens internes capturés: {sum(s.get('links_captured_count', 0) for s in self.snapshot.snapshots.values())}")
-        print(f"   Dossier des captures: {self.snapshot.base_dir}")
-        print(f"   📍 Index principal: file://{os.path.abspath(index_path)}")
-        print("\n💡 Ouvrez le fichier index.html dans votre navigateur pour naviguer!")
-
-def main():
-    print("""
-    🌐 WEB SCRAPER AVEC CAPTURES LOCALES
-    ====================================
-    Ce programme va:
-    1. Scraper les pages web
-    2. Créer des captures HTML locales
-    3. Générer une interface de navigation
-    4. Montrer UNIQUEMENT les liens capturés
-    """)
-    
-    # Configuration
-    start_url = input("Entrez l'URL de départ: ").strip()
-    
-    try:
-        max_depth = int(input("Profondeur de crawling (1-4 recommandé): ").strip())
-        max_pages = int(input("Nombre maximum de pages à scraper (10-100): ").strip())
-        delay = float(input("Délai entre les requêtes (secondes, 1-3 recommandé): ").strip())
-    except ValueError:
-        print("⚠️  Utilisation des valeurs par défaut")
-        max_depth = 2
-        max_pages = 20
-        delay = 1
-    
-    # Créer et lancer le scraper
-    scraper = WebScraperWithSnapshots(
-        base_dir="wayback_snapshots",
-        delay=delay,
-        max_depth=max_depth,
-        max_pages=max_pages
-    )
-    
-    scraper.crawl(start_url)
-    
-    print("\n🎯 Comment utiliser les captures:")
-    print("1. Ouvrez 'wayback_snapshots/index.html' dans votre navigateur")
-    print("2. Naviguez entre les captures via l'interface web")
-    print("3. Chaque capture montre UNIQUEMENT les liens déjà capturés")
-    print("4. Plus de liens non-capturés visibles - seulement les disponibles!")
-
-if __name__ == "__main__":
+import os
+import argparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import time
+import hashlib
+import json
+import threading
+import mimetypes
+import tempfile
+from io import BytesIO
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from functools import partial
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from pathlib import Path
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse, urlencode
+
+from storage import (open_store, migrate_catalog, BlobStore, STORAGE_BACKENDS, COMPRESSIONS,
+                     available_compressions, compress_bytes, decompress_bytes)
+from canonical import UrlCanonicalizer, strip_fragment
+from templating import TemplateLibrary, json_for_script
+from search_index import body_terms, document_terms, write_search_index
+from fulltext import FullTextIndex, extract_text, NON_TEXT_TAGS, MAX_TEXT_CHARS
+from charset import decode_html, SOURCES as CHARSET_SOURCES
+from requisites import RequisiteCache, find_requisites, rewrite_html
+from offline import rewrite_links, strip_base
+from warc import WarcWriter
+from timeline import (DELTA_SUFFIX, KEYFRAME_EVERY, MAX_DELTA_RATIO, line_delta, encode_delta,
+                      nearest_version)
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+class PageAnalyzer(HTMLParser):
+    """Analyse une page en une seule passe : liens, titre, taille et, sur demande, texte"""
+    def __init__(self, base_url, canonicalize=None, collect_text=False):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.canonicalize = canonicalize or UrlCanonicalizer()
+        self.links = set()
+        self.fetch_urls = {}  # url canonique -> première forme rencontrée (sans #fragment)
+        self.title_parts = []
+        self.in_title = False
+        self.title_done = False
+        self.collect_text = collect_text
+        self.text_parts = []
+        self.text_size = 0
+        self.skip_depth = 0  # profondeur dans <script>, <style>...
+    
+    # Interface html.parser
+    def handle_starttag(self, tag, attrs):
+        self.start(tag, dict(attrs))
+    
+    def handle_startendtag(self, tag, attrs):
+        self.start(tag, dict(attrs))
+    
+    def handle_endtag(self, tag):
+        self.end(tag)
+    
+    def handle_data(self, data):
+        self.data(data)
+    
+    # Interface "target" de lxml (mêmes traitements)
+    def start(self, tag, attrib):
+        if tag in ('a', 'link'):
+            href = attrib.get('href')
+            if href is not None:
+                abs_url = urljoin(self.base_url, href.strip())
+                if urlparse(abs_url).scheme in ['http', 'https']:
+                    canonical_url = self.canonicalize(abs_url)
+                    if canonical_url not in self.links:
+                        self.links.add(canonical_url)
+                        self.fetch_urls[canonical_url] = strip_fragment(abs_url)
+        elif tag == 'title' and not self.title_done:
+            self.in_title = True
+        elif tag in NON_TEXT_TAGS:
+            self.skip_depth += 1
+    
+    def end(self, tag):
+        if tag == 'title' and self.in_title:
+            self.in_title = False
+            self.title_done = True
+        elif tag in NON_TEXT_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+    
+    def data(self, data):
+        if self.in_title:
+            self.title_parts.append(data)
+        elif self.collect_text and not self.skip_depth and self.text_size < MAX_TEXT_CHARS:
+            self.text_parts.append(data)
+            self.text_size += len(data)
+    
+    def comment(self, text):
+        pass
+    
+    def close(self):
+        # Appelée en fin de document par html.parser comme par lxml
+        super().close()
+    
+    def result(self, html):
+        """Regroupe les informations extraites"""
+        title = ' '.join(''.join(self.title_parts).split())
+        result = {
+            'links': self.links,
+            'fetch_urls': self.fetch_urls,
+            'title': title or self.base_url,
+            'size': len(html)
+        }
+        if self.collect_text:
+            result['text'] = ' '.join(' '.join(self.text_parts).split())[:MAX_TEXT_CHARS]
+        return result
+
+def analyze_page(html, base_url, canonicalize=None, collect_text=False):
+    """Parse la page une seule fois (lxml si installé, sinon html.parser)"""
+    analyzer = PageAnalyzer(base_url, canonicalize, collect_text)
+    if lxml_etree is not None:
+        parser = lxml_etree.HTMLParser(target=analyzer)
+        parser.feed(html)
+        parser.close()
+    else:
+        analyzer.feed(html)
+        analyzer.close()
+    return analyzer.result(html)
+
+# Styles et scripts communs à toutes les pages générées
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+# Gabarits HTML, compilés une seule fois au démarrage
+TEMPLATES = TemplateLibrary(Path(__file__).resolve().parent / "templates")
+
+# Données de la grille de l'index : fichiers data/snapshots-NNNN.js chargés à la demande
+INDEX_SHARD_SIZE = 1000
+INDEX_FIELDS = ('snapshot_id', 'url', 'title', 'domain', 'timestamp', 'links_found',
+                'links_captured_count', 'preview')
+
+class LocalSnapshot:
+    def __init__(self, base_dir="snapshots", compact_every=500, storage="json", canonicalize=None,
+                 compression=None, fulltext=False, deltas=False, offline_links=False):
+        if compression and compression not in available_compressions():
+            raise ValueError(f"Compression indisponible: {compression} (choix: {', '.join(available_compressions())})")
+        # Compression des fichiers de chaque capture (None, 'gzip' ou 'zstd') ;
+        # l'archive compressée se consulte via le serveur local (--serve)
+        self.compression = compression
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(exist_ok=True)
+        self.canonicalize = canonicalize or UrlCanonicalizer()
+        # Catalogue des captures : dictionnaire snapshot_id -> métadonnées,
+        # persisté en JSON (index.json + journal) ou en SQLite
+        options = {'compact_every': compact_every} if storage == 'json' else {}
+        self.snapshots = open_store(self.base_dir, storage, **options)
+        # HTML originaux dédupliqués, partagés entre captures identiques
+        self.blobs = BlobStore(self.base_dir / "blobs")
+        # Nouvelles versions d'une URL stockées en différences avec une keyframe ;
+        # original.html n'est alors reconstruit que par le serveur local (--serve)
+        self.deltas = deltas
+        # Cache des CSS, images et scripts (RequisiteCache), branché par le scraper
+        self.requisites = None
+        # Liens de la copie hors ligne réécrits vers les captures de l'archive
+        self.offline_links = offline_links
+        # Captures dont l'overlay ne liste pas encore des pages capturées depuis
+        self.dirty_overlays = set()
+        # Index plein texte (fulltext.sqlite) tenu à jour au fil des captures
+        self.fulltext = FullTextIndex(self.base_dir) if fulltext else None
+        self.install_assets()
+    
+    def find_snapshot(self, url):
+        """Retourne l'ID de la capture d'une URL, ou None si elle n'a pas été capturée"""
+        info = self.snapshots.find_by_url(self.canonicalize(url))
+        return info['snapshot_id'] if info else None
+    
+    def save_index(self):
+        """Force l'écriture complète du catalogue"""
+        self.snapshots.flush()
+        if self.fulltext is not None:
+            self.fulltext.commit()
+    
+    def close(self):
+        if self.requisites is not None:
+            self.requisites.close()
+        self.snapshots.close()
+        if self.fulltext is not None:
+            self.fulltext.close()
+    
+    def install_assets(self):
+        """Copie les feuilles de style et scripts partagés dans assets/ (une fois par archive)"""
+        assets_dir = self.base_dir / "assets"
+        assets_dir.mkdir(exist_ok=True)
+        for source in STATIC_DIR.iterdir():
+            if not source.is_file():
+                continue
+            target = assets_dir / source.name
+            content = source.read_bytes()
+            # Réécrit seulement si le fichier manque ou a changé (mise à jour du programme)
+            if not target.exists() or target.read_bytes() != content:
+                target.write_bytes(content)
+    
+    def write_snapshot_file(self, snapshot_id, name, text):
+        """Écrit un fichier texte d'une capture, compressé si l'archive l'est"""
+        path = self.base_dir / snapshot_id / name
+        data = text.encode('utf-8')
+        if self.compression:
+            path = path.with_name(name + COMPRESSIONS[self.compression])
+            data = compress_bytes(data, self.compression)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+    
+    def read_original(self, snapshot_id):
+        """Relit le HTML original d'une capture, quel que soit son mode de stockage"""
+        snap_data = self.snapshots[snapshot_id]
+        if snap_data.get('blob'):
+            return self.blobs.read(self.base_dir / snap_data['blob']).decode('utf-8')
+        return (self.base_dir / snapshot_id / "original.html").read_text(encoding='utf-8')
+    
+    def timeline(self, url):
+        """Captures d'une URL, de la plus ancienne à la plus récente"""
+        return self.snapshots.versions_of(self.canonicalize(url))
+    
+    def nearest(self, url, when):
+        """Capture d'une URL la plus proche d'une date (datetime, ISO ou AAAAMMJJhhmmss)"""
+        return nearest_version(self.timeline(url), when)
+    
+    def store_original(self, url, content):
+        """Stocke le HTML original d'une capture, en entier ou en delta
+        
+        Retourne (sha256 du contenu, chemin du blob, champs du catalogue propres au delta).
+        """
+        content_sha256 = hashlib.sha256(content).hexdigest()
+        previous = self.snapshots.latest_by_url(url) if self.deltas else None
+        # Contenu déjà stocké en entier (ou première version) : rien à gagner
+        if previous is not None and previous.get('content_sha256') and self.blobs.find(content_sha256) is None:
+            keyframe = previous.get('keyframe', previous['content_sha256'])
+            depth = previous.get('delta_depth', 0) + 1
+            base_path = self.blobs.find(keyframe)
+            if depth <= KEYFRAME_EVERY and base_path is not None:
+                ops = line_delta(self.blobs.read(base_path).decode('utf-8'), content.decode('utf-8'))
+                delta = encode_delta(keyframe, ops)
+                if len(delta) <= MAX_DELTA_RATIO * len(content):
+                    _, blob_path = self.blobs.put(delta, suffix='.html' + DELTA_SUFFIX,
+                                                  compression=self.compression)
+                    return content_sha256, blob_path, {'keyframe': keyframe, 'delta_depth': depth}
+        _, blob_path = self.blobs.put(content, compression=self.compression)
+        return content_sha256, blob_path, {}
+    
+    def _locate_capture(self, url):
+        """Chemin de la capture d'une URL depuis une autre capture, ou None"""
+        info = self.snapshots.find_by_url(self.canonicalize(url))
+        return f"../{info['snapshot_id']}/index.html" if info else None
+    
+    def save_offline_copy(self, snapshot_id, url, html):
+        """Écrit offline.html : ressources de la page dans le cache local (--requisites)
+        et liens vers les captures de l'archive (--offline-links)
+        
+        Retourne les champs du catalogue qui décrivent la copie.
+        """
+        html, base_url = strip_base(html, url)
+        fields = {'offline': True}
+        if self.requisites is not None:
+            mapping = self.requisites.localize(find_requisites(html, base_url))
+            html = rewrite_html(html, base_url, lambda link: '../' + mapping[link] if link in mapping else None)
+            fields['requisites'] = len(mapping)
+        if self.offline_links:
+            html, fields['links_local'], fields['links_missing'] = rewrite_links(
+                html, base_url, self._locate_capture)
+        # Fichier propre à la capture (pas un blob) : réécrit quand des liens sont capturés
+        self.write_snapshot_file(snapshot_id, "offline.html", html)
+        return fields
+    
+    def create_snapshot_id(self, url):
+        """Crée un ID unique pour l'URL (toutes ses variantes donnent le même préfixe)"""
+        url = self.canonicalize(url)
+        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+        parsed = urlparse(url)
+        domain = parsed.netloc.replace('.', '_')
+        path = parsed.path.replace('/', '_')[:20] or 'root'
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"{domain}_{path}_{url_hash}_{timestamp}"
+    
+    def _captured_links(self, links):
+        """Liens de la page qui ont une capture : [{url, snapshot_id, title}]"""
+        captured_links = []
+        for link in links:
+            info = self.snapshots.find_by_url(self.canonicalize(link))
+            if info is not None:
+                captured_links.append({
+                    'url': link,
+                    'snapshot_id': info['snapshot_id'],
+                    'title': info['title']
+                })
+        return captured_links
+    
+    @staticmethod
+    def _link_icon(link):
+        """Détermine l'icône selon le type de lien"""
+        if "lemonde.fr" in link:
+            return "fa-newspaper"
+        if "youtube.com" in link or "vimeo.com" in link:
+            return "fa-video"
+        if "github.com" in link:
+            return "fa-code-branch"
+        if "twitter.com" in link or "facebook.com" in link:
+            return "fa-share-alt"
+        if "reddit.com" in link:
+            return "fa-reddit"
+        if "discord.com" in link or "discord.gg" in link:
+            return "fa-discord"
+        return "fa-link"
+    
+    def _generate_captured_links_html(self, captured_links):
+        """Génère le HTML UNIQUEMENT pour les liens CAPTURÉS"""
+        if not captured_links:
+            return TEMPLATES['captured_links_empty'].render({})
+        
+        return TEMPLATES['captured_link'].render_many(
+            {
+                'url': link_data['url'],
+                'snapshot_id': link_data['snapshot_id'],
+                'truncated_url': link_data['url'][:70] + "..." if len(link_data['url']) > 70 else link_data['url'],
+                'icon': self._link_icon(link_data['url']),
+                'position': i + 1
+            }
+            for i, link_data in enumerate(captured_links[:50])  # Limite à 50 liens capturés
+        )
+    
+    def save_html_snapshot(self, url, html, page, extra=None):
+        """Sauvegarde une capture HTML et crée une version navigable
+        
+        page est le résultat de analyze_page (liens, titre, taille) ; extra des
+        champs ajoutés au catalogue (en-têtes ETag / Last-Modified gardés pour le
+        re-crawl, position de la réponse dans les fichiers WARC).
+        """
+        url = self.canonicalize(url)
+        links = page['links']
+        title = page['title']
+        snapshot_id = self.create_snapshot_id(url)
+        snapshot_dir = self.base_dir / snapshot_id
+        snapshot_dir.mkdir(exist_ok=True)
+        
+        # Fichier HTML original : stocké une seule fois par contenu, la capture
+        # pointe vers le blob (original.html.delta si c'est une différence)
+        content = html.encode('utf-8')
+        content_sha256, blob_path, delta_fields = self.store_original(url, content)
+        original_name = "original.html" + (DELTA_SUFFIX if delta_fields else "") + \
+            (COMPRESSIONS[self.compression] if self.compression else "")
+        self.blobs.link(blob_path, snapshot_dir / original_name)
+        
+        # Copie consultable hors ligne (ressources en local, liens vers l'archive)
+        offline_fields = {}
+        if self.requisites is not None or self.offline_links:
+            offline_fields = self.save_offline_copy(snapshot_id, url, html)
+        
+        # Créer une version modifiée avec navigation
+        self.create_navigable_html(url, page, snapshot_id,
+                                   frame="offline.html" if offline_fields else "original.html")
+        
+        # Première capture de cette URL : les pages qui pointent vers elle
+        # devront ajouter le lien à leur overlay
+        first_capture = self.snapshots.find_by_url(url) is None
+        
+        # Sauvegarder les métadonnées (ajout au journal ou à la base)
+        record = {
+            'url': url,
+            'title': title[:100] if title else url,
+            'timestamp': datetime.now().isoformat(),
+            'snapshot_id': snapshot_id,
+            'path': f"{snapshot_id}/index.html",
+            'size': page['size'],
+            'content_sha256': content_sha256,
+            'content_size': len(content),
+            'stored_size': blob_path.stat().st_size,
+            'blob': blob_path.relative_to(self.base_dir).as_posix(),
+            'links_found': len(links),
+            'links_available': list(links),
+            'domain': urlparse(url).netloc
+        }
+        record.update(delta_fields)
+        record.update(offline_fields)
+        if extra:
+            record.update(extra)
+        if page.get('text'):
+            # Mots du texte pour l'index de recherche (--index-text)
+            record['body_terms'] = body_terms(page['text'])
+        self.snapshots[snapshot_id] = record
+        if self.fulltext is not None:
+            text = page['text'] if 'text' in page else extract_text(html)
+            self.fulltext.add(record, text)
+        if first_capture:
+            self.dirty_overlays.update(self.snapshots.linking_to(url))
+        return snapshot_id
+    
+    def mark_unchanged(self, snapshot_id, validators=None):
+        """Note qu'une capture a été revérifiée sans changement (re-crawl)"""
+        record = dict(self.snapshots[snapshot_id], last_checked=datetime.now().isoformat())
+        if validators:
+            record.update(validators)
+        self.snapshots[snapshot_id] = record
+    
+    def update_captured_links(self):
+        """Met à jour la liste des liens capturés pour chaque snapshot"""
+        self.snapshots.refresh_captured_links()
+    
+    def overlay_context(self, url, page, snapshot_id, captured_at=None, frame="original.html"):
+        """Données affichées dans l'overlay d'une capture"""
+        links = page['links']
+        page_title = page['title'] or url
+        truncated_title = page_title[:60] + "..." if len(page_title) > 60 else page_title
+        captured_links = self._captured_links(links)
+        domain = urlparse(url).netloc
+        return {
+            'title': truncated_title,
+            'snapshot_id': snapshot_id,
+            'url_short': url[:80] + ('...' if len(url) > 80 else ''),
+            'links_found': len(links),
+            'captured_count': len(captured_links),
+            'links_search': TEMPLATES['links_search'].render({}) if captured_links else '',
+            'links_html': self._generate_captured_links_html(captured_links),
+            'domain': domain,
+            'captured_at': (captured_at or datetime.now()).strftime('%d/%m/%Y %H:%M'),
+            'size_kb': page['size'] // 1024,
+            'frame': frame
+        }
+    
+    def create_navigable_html(self, url, page, snapshot_id, frame="original.html"):
+        """Crée une version HTML avec navigation élégante et interactive"""
+        overlay_html = TEMPLATES['overlay'].render(self.overlay_context(url, page, snapshot_id, frame=frame))
+        self.write_snapshot_file(snapshot_id, "index.html", overlay_html)
+        return snapshot_id
+    
+    def rebuild_dirty_overlays(self):
+        """Régénère en une passe les overlays (et copies hors ligne) marqués par de nouvelles captures"""
+        dirty = self.dirty_overlays
+        self.dirty_overlays = set()
+        rebuilt = 0
+        for snapshot_id in dirty:
+            try:
+                snap_data = self.snapshots[snapshot_id]
+            except KeyError:
+                continue
+            page = {
+                'links': snap_data.get('links_available', []),
+                'title': snap_data.get('title'),
+                'size': snap_data.get('size', 0)
+            }
+            captured_at = datetime.fromisoformat(snap_data['timestamp']) if snap_data.get('timestamp') else None
+            if self.offline_links and snap_data.get('links_missing'):
+                # Des pages visées par la copie hors ligne ont pu être capturées depuis
+                fields = self.save_offline_copy(snapshot_id, snap_data['url'], self.read_original(snapshot_id))
+                snap_data = dict(snap_data, **fields)
+                self.snapshots[snapshot_id] = snap_data
+            frame = "offline.html" if snap_data.get('offline') else "original.html"
+            overlay_html = TEMPLATES['overlay'].render(
+                self.overlay_context(snap_data['url'], page, snapshot_id, captured_at, frame))
+            self.write_snapshot_file(snapshot_id, "index.html", overlay_html)
+            rebuilt += 1
+        return rebuilt
+    
+    @staticmethod
+    def _index_row(snap_data):
+        """Ligne compacte d'une capture pour la grille (champs de INDEX_FIELDS)"""
+        preview = [[link['url'], link['snapshot_id']] for link in snap_data.get('links_captured', [])[:3]]
+        return [snap_data['snapshot_id'], snap_data['url'], snap_data.get('title') or '',
+                snap_data.get('domain') or '', snap_data.get('timestamp') or '',
+                snap_data.get('links_found', 0), snap_data.get('links_captured_count', 0), preview]
+    
+    def write_index_shards(self, shard_size=INDEX_SHARD_SIZE):
+        """Écrit les données de la grille en fichiers JSONP (lisibles aussi en file://)
+        
+        Les captures sont triées de la plus récente à la plus ancienne : la vue par
+        défaut n'a besoin que des premiers fichiers. L'index de recherche désigne
+        les captures par leur rang dans cet ordre. Retourne le manifeste.
+        """
+        data_dir = self.base_dir / "data"
+        data_dir.mkdir(exist_ok=True)
+        entries = sorted(((self._index_row(s), document_terms(s)) for s in self.snapshots.values()),
+                         key=lambda entry: entry[0][4], reverse=True)
+        rows = [row for row, _ in entries]
+        search = write_search_index(data_dir, ((number, terms) for number, (_, terms) in enumerate(entries)))
+        shards = []
+        for start in range(0, len(rows), shard_size):
+            name = f"snapshots-{len(shards):04d}.js"
+            payload = json.dumps(rows[start:start + shard_size], ensure_ascii=False, separators=(',', ':'))
+            with open(data_dir / name, 'w', encoding='utf-8') as f:
+                f.write(f"archiveShardLoaded({len(shards)},{payload});\n")
+            shards.append(name)
+        # Fichiers d'une génération précédente plus grande
+        for stale in data_dir.glob("snapshots-*.js"):
+            if stale.name not in shards:
+                stale.unlink()
+        return {
+            'version': int(time.time()),
+            'fields': list(INDEX_FIELDS),
+            'shard_size': shard_size,
+            'total': len(rows),
+            'shards': shards,
+            'domains': sorted({row[3] for row in rows}),
+            'search': search
+        }
+    
+    def generate_index_page(self):
+        """Génère une page d'index pour naviguer entre toutes les captures"""
+        
+        # Met à jour les liens capturés avant de générer l'index
+        self.update_captured_links()
+        
+        # Calculer les statistiques globales
+        stats = self.snapshots.stats()
+        total_snapshots = stats['snapshots']
+        total_domains = stats['domains']
+        total_links_found = stats['links_found']
+        total_links_captured = stats['links_captured']
+        coverage = round((total_links_captured / total_links_found * 100)) if total_links_found > 0 else 0
+        dedup_ratio = stats['content_bytes'] / stats['unique_bytes'] if stats['unique_bytes'] > 0 else 1
+        
+        html = TEMPLATES['index'].render({
+            'total_snapshots': total_snapshots,
+            'total_domains': total_domains,
+            'total_links_captured': total_links_captured,
+            'coverage': coverage,
+            'dedup_ratio': f"{dedup_ratio:.1f}",
+            'manifest_json': json_for_script(self.write_index_shards())
+        })
+        
+        index_file = self.base_dir / "index.html"
+        with open(index_file, 'w', encoding='utf-8') as f:
+            f.write(html)
+        
+        print(f"✅ Index généré: {index_file}")
+        return str(index_file)
+
+class HostRateLimiter:
+    """Garantit un intervalle minimal entre deux requêtes vers un même hôte"""
+    def __init__(self, delay):
+        self.delay = delay
+        self.next_slot = {}
+        self.lock = threading.Lock()
+    
+    def wait(self, url):
+        """Bloque jusqu'au prochain créneau libre pour l'hôte de l'URL"""
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            # Réserver le créneau suivant avant de relâcher le verrou
+            self.next_slot[host] = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+class CountingAdapter(HTTPAdapter):
+    """HTTPAdapter qui compte les requêtes envoyées et les connexions TCP ouvertes"""
+    def __init__(self, *args, **kwargs):
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self.counter_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+    
+    def _count(self, attribute):
+        with self.counter_lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+    
+    def _counting_pool_class(self, pool_class):
+        """Dérive une classe de pool dont les connexions signalent leurs ouvertures"""
+        adapter = self
+        
+        class CountingConnection(pool_class.ConnectionCls):
+            def connect(self):
+                adapter._count('connections_opened')
+                super().connect()
+            
+            def request(self, *args, **kwargs):
+                adapter._count('requests_sent')
+                return super().request(*args, **kwargs)
+        
+        return type(pool_class.__name__, (pool_class,), {'ConnectionCls': CountingConnection})
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: self._counting_pool_class(pool_class)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+class HostSessionPool:
+    """Sessions HTTP persistantes (keep-alive), une par hôte"""
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, headers, pool_size=10, retries=3, backoff=0.5):
+        self.headers = headers
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self.sessions = {}
+        self.lock = threading.Lock()
+    
+    def _create_session(self):
+        """Crée une session avec réutilisation des connexions et relances automatiques"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = CountingAdapter(pool_connections=2, pool_maxsize=self.pool_size, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def get(self, url):
+        """Retourne la session associée à l'hôte de l'URL"""
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = self.sessions[host] = self._create_session()
+            return session
+    
+    def connection_stats(self):
+        """Agrège les compteurs de requêtes et de connexions de toutes les sessions"""
+        requests_sent = 0
+        connections_opened = 0
+        with self.lock:
+            sessions = list(self.sessions.values())
+        for session in sessions:
+            for adapter in set(session.adapters.values()):
+                if isinstance(adapter, CountingAdapter):
+                    requests_sent += adapter.requests_sent
+                    connections_opened += adapter.connections_opened
+        return {
+            'requests': requests_sent,
+            'connections': connections_opened,
+            'reused': max(0, requests_sent - connections_opened)
+        }
+    
+    def close(self):
+        """Ferme toutes les connexions ouvertes"""
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+class CrawlFrontier:
+    """File BFS des URLs à visiter : ajout et retrait en O(1), chaque URL n'est mise en file qu'une fois"""
+    def __init__(self):
+        self.queue = deque()
+        self.seen = set()
+        self.peak_size = 0
+    
+    def push(self, url, depth, fetch_url=None):
+        """Ajoute une URL canonique si elle n'a jamais été mise en file ; retourne True si ajoutée
+        
+        fetch_url est la forme à télécharger (par défaut l'URL canonique elle-même)
+        """
+        if url in self.seen:
+            return False
+        self.seen.add(url)
+        self.queue.append((url, depth, fetch_url or url))
+        self.peak_size = max(self.peak_size, len(self.queue))
+        return True
+    
+    def pop(self):
+        """Retourne (url canonique, profondeur, url à télécharger)"""
+        return self.queue.popleft()
+    
+    def __len__(self):
+        return len(self.queue)
+
+CRAWL_STATE_FILE = "crawl_state.json"
+
+# Types de contenu analysés comme des pages ; le reste est abandonné dès les en-têtes
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Au-delà, le corps en cours de téléchargement passe de la mémoire à un fichier temporaire
+SPOOL_MAX_MEMORY = 1024 * 1024
+# Validateurs HTTP gardés dans le catalogue pour les requêtes conditionnelles (--recrawl)
+VALIDATOR_HEADERS = {'etag': 'ETag', 'last_modified': 'Last-Modified'}
+
+def load_crawl_state(base_dir):
+    """Lit le point de reprise d'une archive (None s'il n'existe pas)"""
+    state_file = Path(base_dir) / CRAWL_STATE_FILE
+    if not state_file.exists():
+        return None
+    with open(state_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class WebScraperWithSnapshots:
+    def __init__(self, base_dir="snapshots", delay=1, max_depth=3, max_pages=100, workers=4,
+                 pool_size=10, retries=3, storage="json", canonicalizer=None, checkpoint_every=10,
+                 compression=None, overlay_refresh_every=50, index_text=False, fulltext=False,
+                 max_body_size=10 * 1024 * 1024, recrawl=False, deltas=False, requisites=False,
+                 offline_links=False, warc=False, warc_max_size=1024 * 1024 * 1024):
+        # Toutes les URLs (liens, pages visitées, IDs de capture) passent par la même canonicalisation
+        self.canonicalize = canonicalizer or UrlCanonicalizer()
+        self.snapshot = LocalSnapshot(base_dir, storage=storage, canonicalize=self.canonicalize,
+                                      compression=compression, fulltext=fulltext, deltas=deltas,
+                                      offline_links=offline_links)
+        self.visited = set()
+        self.delay = delay
+        self.workers = max(1, workers)
+        self.rate_limiter = HostRateLimiter(delay)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.pages_scraped = 0
+        # Point de reprise, réécrit toutes les checkpoint_every pages
+        self.state_file = self.snapshot.base_dir / CRAWL_STATE_FILE
+        self.checkpoint_every = checkpoint_every
+        # Les overlays des pages déjà capturées sont mis à jour par lots
+        self.overlay_refresh_every = overlay_refresh_every
+        self.overlays_rebuilt = 0
+        # Indexer aussi le texte des pages (pas seulement titre et URL)
+        self.index_text = index_text
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        }
+        self.sessions = HostSessionPool(self.headers, pool_size=max(pool_size, self.workers), retries=retries)
+        # Téléchargements en flux : taille maximale d'une page, fichiers temporaires dans l'archive
+        self.max_body_size = max_body_size
+        self.download_dir = self.snapshot.base_dir / "tmp"
+        self.download_dir.mkdir(exist_ok=True)
+        self.skipped = {'type': 0, 'size': 0}
+        # Comment l'encodage de chaque page a été déterminé (en-tête, meta, détection...)
+        self.charset_sources = dict.fromkeys(CHARSET_SOURCES, 0)
+        self.skipped_lock = threading.Lock()
+        # Re-crawl incrémental : requêtes conditionnelles, pas de capture si rien n'a changé
+        self.recrawl = recrawl
+        self.unchanged = {'not_modified': 0, 'same_content': 0}
+        # Requêtes et réponses brutes (en-têtes, statut, octets reçus) en fichiers WARC
+        self.warc = WarcWriter(self.snapshot.base_dir / "warc", max_size=warc_max_size) if warc else None
+        # Ressources des pages (CSS, images, scripts) pour la consultation hors ligne
+        if requisites:
+            self.snapshot.requisites = RequisiteCache(self.snapshot.base_dir, self.fetch_requisite,
+                                                      workers=self.workers)
+    
+    def _skip(self, reason, url, detail):
+        with self.skipped_lock:
+            self.skipped[reason] += 1
+        print(f"⏭️  Ignoré ({detail}): {url}")
+    
+    def conditional_headers(self, url):
+        """En-têtes If-None-Match / If-Modified-Since tirés de la dernière capture de url"""
+        previous = self.snapshot.snapshots.latest_by_url(url)
+        if previous is None:
+            return {}
+        headers = {}
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+        return headers
+    
+    def fetch_html(self, url):
+        """Récupère le contenu HTML d'une URL en flux, sans dépasser max_body_size"""
+        result = self.fetch(url)
+        return result['html'] if result else None
+    
+    def fetch(self, url, conditional_headers=None):
+        """Télécharge une page ; retourne {html, not_modified, validators} ou None
+        
+        Avec conditional_headers, un 304 donne not_modified=True et html=None.
+        validators contient les en-têtes ETag / Last-Modified de la réponse ;
+        si l'archive garde des fichiers WARC, 'exchanges' contient les échanges
+        HTTP complets (redirections comprises) à y écrire.
+        """
+        try:
+            self.rate_limiter.wait(url)
+            with self.sessions.get(url).get(url, timeout=10, stream=True,
+                                            headers=conditional_headers) as response:
+                response.raise_for_status()
+                validators = {key: response.headers[header]
+                              for key, header in VALIDATOR_HEADERS.items() if response.headers.get(header)}
+                if response.status_code == 304:
+                    return {'html': None, 'not_modified': True, 'validators': validators}
+                
+                # Type et taille annoncés vérifiés avant de lire le corps
+                content_type_header = response.headers.get('Content-Type', '')
+                content_type = content_type_header.split(';')[0].strip().lower()
+                if content_type and content_type not in HTML_CONTENT_TYPES:
+                    self._skip('type', url, content_type)
+                    return None
+                declared_size = response.headers.get('Content-Length', '')
+                if declared_size.isdigit() and int(declared_size) > self.max_body_size:
+                    self._skip('size', url, f"{int(declared_size) // 1024} Ko annoncés")
+                    return None
+                
+                # Le corps passe sur disque au-delà de SPOOL_MAX_MEMORY ; la limite
+                # porte sur les octets décompressés (Content-Encoding)
+                with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY, dir=self.download_dir) as body:
+                    size = 0
+                    for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > self.max_body_size:
+                            self._skip('size', url, f"plus de {self.max_body_size // 1024} Ko")
+                            return None
+                        body.write(chunk)
+                    body.seek(0)
+                    data = body.read()
+            html, source = decode_html(data, content_type_header)
+            with self.skipped_lock:
+                self.charset_sources[source] += 1
+            result = {'html': html, 'not_modified': False, 'validators': validators}
+            if self.warc is not None:
+                result['exchanges'] = [self._exchange(r, r.content) for r in response.history]
+                result['exchanges'].append(self._exchange(response, data))
+            return result
+        except Exception as e:
+            print(f"❌ Erreur lors du fetch {url}: {e}")
+            return None
+    
+    @staticmethod
+    def _exchange(response, body):
+        """Requête et réponse telles qu'elles seront écrites dans le WARC"""
+        version = getattr(response.raw, 'version', 11) or 11
+        return {
+            'url': response.url,
+            'request_headers': list(response.request.headers.items()),
+            'status': response.status_code,
+            'reason': response.reason or '',
+            'http_version': f"HTTP/{version // 10}.{version % 10}",
+            'response_headers': list(response.raw.headers.items()),
+            'body': body,
+            'date': datetime.now(timezone.utc)
+        }
+    
+    def _write_warc(self, fetched):
+        """Écrit les échanges d'un téléchargement ; retourne la position de la dernière réponse"""
+        location = None
+        for exchange in fetched.get('exchanges', []):
+            try:
+                location = self.warc.write_exchange(**exchange)
+            except Exception as e:
+                print(f"❌ Erreur d'écriture WARC {exchange['url']}: {e}")
+        return location
+    
+    def fetch_requisite(self, url):
+        """Télécharge une ressource de page (thread du cache) ; retourne (octets, type de contenu)
+        
+        Pas de délai par hôte : les ressources d'une page sont demandées d'un bloc,
+        comme le ferait un navigateur, et chacune une seule fois par archive.
+        """
+        with self.sessions.get(url).get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            body = BytesIO()
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                if body.tell() + len(chunk) > self.max_body_size:
+                    raise ValueError(f"plus de {self.max_body_size // 1024} Ko")
+                body.write(chunk)
+            return body.getvalue(), response.headers.get('Content-Type', '')
+    
+    def extract_links(self, html, base_url):
+        """Extrait tous les liens d'une page HTML (URLs canoniques)"""
+        return analyze_page(html, base_url, self.canonicalize)['links']
+    
+    def scrape_page(self, url, depth):
+        """Scrape une page unique et crée une capture"""
+        fetch_url = strip_fragment(url)
+        url = self.canonicalize(url)
+        if (depth > self.max_depth or 
+            url in self.visited or 
+            self.pages_scraped >= self.max_pages):
+            return {}
+        
+        print(f"📥 Scraping (niveau {depth}): {fetch_url}")
+        
+        result = self.fetch(fetch_url, self.conditional_headers(url) if self.recrawl else None) or {}
+        return self.process_page(url, depth, result.get('html'), fetch_url, result)
+    
+    def process_page(self, url, depth, html, base_url=None, fetched=None):
+        """Analyse une page déjà téléchargée et crée sa capture
+        
+        url est la forme canonique, base_url l'adresse réellement téléchargée
+        (sert à résoudre les liens relatifs), fetched le résultat de fetch.
+        Retourne les liens découverts sous la forme {url canonique: url à télécharger}.
+        """
+        fetched = fetched or {}
+        if url in self.visited or self.pages_scraped >= self.max_pages:
+            return {}
+        previous = self.snapshot.snapshots.latest_by_url(url) if self.recrawl else None
+        if fetched.get('not_modified') and previous is not None:
+            return self._process_unchanged(url, previous, fetched, 'not_modified')
+        if not html:
+            return {}
+        warc_location = self._write_warc(fetched) if self.warc is not None else None
+        # Contenu identique à la dernière capture (serveur sans validateurs fiables)
+        if previous is not None and \
+                previous.get('content_sha256') == hashlib.sha256(html.encode('utf-8')).hexdigest():
+            return self._process_unchanged(url, previous, fetched, 'same_content')
+        
+        self.visited.add(url)
+        self.pages_scraped += 1
+        
+        # Extraire liens, titre et taille en une seule analyse
+        # Le texte sert à l'index de la page d'accueil et à l'index plein texte
+        page = analyze_page(html, base_url or url, self.canonicalize,
+                            collect_text=self.index_text or self.snapshot.fulltext is not None)
+        links = page['links']
+        print(f"   🔗 Trouvé {len(links)} liens ({url})")
+        
+        # Créer la capture
+        extra = dict(fetched.get('validators') or {})
+        if warc_location:
+            extra['warc'] = warc_location
+        snapshot_id = self.snapshot.save_html_snapshot(url, html, page, extra)
+        print(f"   💾 Capture créée: {snapshot_id}")
+        
+        return page['fetch_urls']
+    
+    def _process_unchanged(self, url, previous, fetched, reason):
+        """Page identique à sa dernière capture : pas de nouvelle capture, liens déjà connus"""
+        self.visited.add(url)
+        self.pages_scraped += 1
+        self.unchanged[reason] += 1
+        self.snapshot.mark_unchanged(previous['snapshot_id'], fetched.get('validators'))
+        detail = "304" if reason == 'not_modified' else "contenu identique"
+        print(f"   ♻️  Inchangée ({detail}), capture conservée: {previous['snapshot_id']}")
+        # Mêmes octets, mêmes liens : on reprend ceux de la capture sans réanalyser
+        return {link: link for link in previous.get('links_available', [])}
+    
+    def _fetch_task(self, url, depth, conditional_headers=None):
+        """Téléchargement exécuté dans un worker"""
+        print(f"📥 Scraping (niveau {depth}): {url}")
+        return self.fetch(url, conditional_headers)
+    
+    def save_checkpoint(self, start_url, frontier, in_flight, finished=False):
+        """Écrit l'état du crawl (file d'attente, pages visitées) à côté de index.json"""
+        # Les pages indexées en plein texte doivent l'être au moins jusqu'au point de reprise
+        if self.snapshot.fulltext is not None:
+            self.snapshot.fulltext.commit()
+        # Les téléchargements en cours sont remis en tête de file
+        pending = [list(item) for item in in_flight.values()] + [list(item) for item in frontier.queue]
+        state = {
+            'start_url': start_url,
+            'finished': finished,
+            'updated': datetime.now().isoformat(),
+            'config': {
+                'max_depth': self.max_depth,
+                'max_pages': self.max_pages,
+                'delay': self.delay,
+                'workers': self.workers,
+                'compression': self.snapshot.compression,
+                'index_text': self.index_text,
+                'fulltext': self.snapshot.fulltext is not None,
+                'max_body_size': self.max_body_size,
+                'recrawl': self.recrawl,
+                'deltas': self.snapshot.deltas,
+                'requisites': self.snapshot.requisites is not None,
+                'offline_links': self.snapshot.offline_links,
+                'warc': self.warc is not None,
+                'warc_max_size': self.warc.max_size if self.warc is not None else None
+            },
+            'pages_scraped': self.pages_scraped,
+            'peak_frontier': frontier.peak_size,
+            'visited': list(self.visited),
+            'seen': list(frontier.seen),
+            'frontier': pending,
+            'dirty_overlays': list(self.snapshot.dirty_overlays)
+        }
+        tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+    
+    def restore_checkpoint(self, state, frontier):
+        """Reconstruit la file et les pages visitées depuis le point de reprise et les captures"""
+        self.visited = set(state['visited'])
+        self.pages_scraped = state['pages_scraped']
+        frontier.seen = set(state['seen'])
+        frontier.peak_size = state.get('peak_frontier', 0)
+        self.snapshot.dirty_overlays.update(state.get('dirty_overlays', []))
+        recovered = 0
+        
+        for url, depth, fetch_url in state['frontier']:
+            if url in self.visited:
+                continue
+            snapshot_id = self.snapshot.find_snapshot(url)
+            if snapshot_id is None:
+                frontier.queue.append((url, depth, fetch_url))
+                continue
+            # Page capturée après le dernier point de reprise : on ne la retélécharge
+            # pas, mais ses liens doivent quand même rejoindre la file
+            self.visited.add(url)
+            self.pages_scraped += 1
+            recovered += 1
+            if depth + 1 <= self.max_depth:
+                for link in self.snapshot.snapshots[snapshot_id].get('links_available', []):
+                    if link not in self.visited:
+                        frontier.push(link, depth + 1)
+        
+        frontier.peak_size = max(frontier.peak_size, len(frontier))
+        print(f"♻️  Reprise: {self.pages_scraped} pages déjà capturées "
+              f"(dont {recovered} après le dernier point de reprise), {len(frontier)} URLs en attente")
+    
+    def crawl(self, start_url=None, resume=False):
+        """Lance le crawling récursif avec un pool de workers
+        
+        Avec resume=True, repart du point de reprise crawl_state.json de l'archive.
+        """
+        frontier = CrawlFrontier()
+        state = load_crawl_state(self.snapshot.base_dir) if resume else None
+        if resume and state is None:
+            print("⚠️  Aucun point de reprise trouvé, démarrage d'un nouveau crawl")
+        if state is not None:
+            if state.get('finished'):
+                print("✅ Le crawl enregistré est déjà terminé, rien à reprendre")
+                return
+            start_url = state['start_url']
+        if not start_url:
+            raise ValueError("Aucune URL de départ")
+        
+        print(f"🚀 Démarrage du crawling depuis: {start_url}")
+        print(f"⚙️  Configuration: profondeur={self.max_depth}, délai={self.delay}s par hôte, "
+              f"max={self.max_pages} pages, workers={self.workers}")
+        print("=" * 60)
+        
+        if state is not None:
+            self.restore_checkpoint(state, frontier)
+        else:
+            frontier.push(self.canonicalize(start_url), 0, strip_fragment(start_url))
+        in_flight = {}  # future -> (url canonique, profondeur, url téléchargée)
+        last_checkpoint = self.pages_scraped
+        last_overlay_refresh = self.pages_scraped
+        
+        # Les téléchargements se font en parallèle, l'analyse et la sauvegarde
+        # restent dans le thread principal (LocalSnapshot n'est pas thread-safe)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while (frontier or in_flight) and self.pages_scraped < self.max_pages:
+                    while (frontier and len(in_flight) < self.workers and
+                           self.pages_scraped + len(in_flight) < self.max_pages):
+                        url, depth, fetch_url = frontier.pop()
+                        if url in self.visited:
+                            continue
+                        # Le catalogue n'est lu que dans le thread principal
+                        headers = self.conditional_headers(url) if self.recrawl else None
+                        future = executor.submit(self._fetch_task, fetch_url, depth, headers)
+                        in_flight[future] = (url, depth, fetch_url)
+                    
+                    if not in_flight:
+                        continue
+                    
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url, depth, fetch_url = in_flight.pop(future)
+                        result = future.result() or {}
+                        new_links = self.process_page(url, depth, result.get('html'), fetch_url, result)
+                        
+                        # Ajouter les nouveaux liens à visiter (une seule fois chacun)
+                        if depth + 1 <= self.max_depth:
+                            for link, link_fetch_url in new_links.items():
+                                if link not in self.visited:
+                                    frontier.push(link, depth + 1, link_fetch_url)
+                    
+                    if self.pages_scraped - last_checkpoint >= self.checkpoint_every:
+                        self.save_checkpoint(start_url, frontier, in_flight)
+                        last_checkpoint = self.pages_scraped
+
+                    if self.pages_scraped - last_overlay_refresh >= self.overlay_refresh_every:
+                        self.overlays_rebuilt += self.snapshot.rebuild_dirty_overlays()
+                        last_overlay_refresh = self.pages_scraped
+            except KeyboardInterrupt:
+                for future in in_flight:
+                    future.cancel()
+                self.save_checkpoint(start_url, frontier, in_flight)
+                self.snapshot.save_index()
+                if self.warc is not None:
+                    self.warc.close()
+                print("\n⏸️  Crawl interrompu, état sauvegardé. Relancez avec --resume pour continuer.")
+                return
+            
+            # Ne pas attendre indéfiniment les téléchargements devenus inutiles
+            for future in in_flight:
+                future.cancel()
+        
+        # Dernière passe sur les overlays qui ne listent pas encore les pages capturées après eux
+        self.overlays_rebuilt += self.snapshot.rebuild_dirty_overlays()
+        
+        self.save_checkpoint(start_url, frontier, {}, finished=True)
+        if self.warc is not None:
+            self.warc.close()
+        connection_stats = self.sessions.connection_stats()
+        self.sessions.close()
+        
+        # Générer l'index final
+        index_path = self.snapshot.generate_index_page()
+        print("=" * 60)
+        print(f"✅ Crawling terminé!")
+        print(f"📊 Statistiques:")
+        print(f"   Pages visitées: {len(self.visited)}")
+        print(f"   URLs découvertes: {len(frontier.seen)} (file d'attente max: {frontier.peak_size})")
+        stats = self.snapshot.snapshots.stats()
+        print(f"   Captures dans l'archive: {stats['snapshots']}")
+        if self.recrawl:
+            print(f"   Pages inchangées: {sum(self.unchanged.values())} "
+                  f"({self.unchanged['not_modified']} réponses 304, "
+                  f"{self.unchanged['same_content']} contenus identiques)")
+        print(f"   Liens internes capturés: {stats['links_captured']}")
+        print(f"   Overlays mis à jour après coup: {self.overlays_rebuilt}")
+        if self.warc is not None:
+            print(f"   WARC: {self.warc.records} enregistrements dans {self.warc.directory} "
+                  f"({self.warc.sequence} fichier(s), index {self.warc.cdx_file.name})")
+        if self.snapshot.requisites is not None:
+            print(f"   Ressources des pages: {self.snapshot.requisites.downloaded} téléchargées, "
+                  f"{self.snapshot.requisites.reused} déjà en cache")
+        if stats['unique_bytes']:
+            print(f"   HTML original: {stats['content_bytes'] // 1024} Ko capturés, "
+                  f"{stats['unique_bytes'] // 1024} Ko uniques "
+                  f"(déduplication ×{stats['content_bytes'] / stats['unique_bytes']:.2f}), "
+                  f"{stats['stored_bytes'] // 1024} Ko sur disque")
+        labels = {'bom': 'BOM', 'header': 'en-tête', 'meta': '<meta>', 'utf8': 'UTF-8 valide',
+                  'detection': 'détection', 'default': 'par défaut'}
+        print("   Encodages: " + ", ".join(f"{count} {labels[source]}"
+                                         for source, count in self.charset_sources.items() if count))
+        if any(self.skipped.values()):
+            print(f"   Réponses abandonnées: {self.skipped['type']} non HTML, "
+                  f"{self.skipped['size']} trop volumineuses (> {self.max_body_size // 1024} Ko)")
+        print(f"   Requêtes HTTP: {connection_stats['requests']} "
+              f"({connection_stats['connections']} connexions ouvertes, {connection_stats['reused']} réutilisées)")
+        print(f"   Dossier des captures: {self.snapshot.base_dir}")
+        print(f"   📍 Index principal: file://{os.path.abspath(index_path)}")
+        print("\n💡 Ouvrez le fichier index.html dans votre navigateur pour naviguer!")
+
+class ArchiveRequestHandler(SimpleHTTPRequestHandler):
+    """Sert l'archive en local ; les fichiers .gz/.zst sont envoyés tels quels au
+    navigateur s'il les accepte, sinon décompressés à la volée, et les versions
+    stockées en delta sont reconstruites"""
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if not os.path.exists(path):
+            for method, suffix in COMPRESSIONS.items():
+                if os.path.exists(path + suffix):
+                    return self.send_compressed(path, path + suffix, method)
+            for suffix in ('', *COMPRESSIONS.values()):
+                if os.path.exists(path + DELTA_SUFFIX + suffix):
+                    return self.send_delta(path, path + DELTA_SUFFIX + suffix)
+        return super().send_head()
+    
+    def send_delta(self, path, stored_path):
+        """Version stockée en différence : reconstruite à partir de sa keyframe"""
+        data = BlobStore(Path(self.directory) / "blobs").read(stored_path)
+        self.send_response(200)
+        self.send_header("Content-Type", (mimetypes.guess_type(path)[0] or 'application/octet-stream')
+                         + "; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        return BytesIO(data)
+    
+    def send_compressed(self, path, stored_path, method):
+        with open(stored_path, 'rb') as f:
+            data = f.read()
+        accepted = [e.split(';')[0].strip() for e in self.headers.get('Accept-Encoding', '').split(',')]
+        self.send_response(200)
+        self.send_header("Content-Type", (mimetypes.guess_type(path)[0] or 'application/octet-stream')
+                         + "; charset=utf-8")
+        self.send_header("Vary", "Accept-Encoding")
+        # Les noms des modes de compression sont aussi ceux des Content-Encoding
+        if method in accepted:
+            self.send_header("Content-Encoding", method)
+        else:
+            data = decompress_bytes(data, method)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        return BytesIO(data)
+
+def serve_archive(base_dir, port=8000):
+    """Lance un serveur HTTP local pour consulter l'archive (compressée ou non)"""
+    handler = partial(ArchiveRequestHandler, directory=str(base_dir))
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    print(f"🌐 Archive servie sur http://127.0.0.1:{port}/index.html (Ctrl+C pour arrêter)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Serveur arrêté")
+    finally:
+        server.server_close()
+
+def build_fulltext_index(base_dir, storage='json', rebuild=False):
+    """Indexe hors ligne le contenu des captures d'une archive existante"""
+    archive = LocalSnapshot(base_dir, storage=storage, fulltext=True)
+    try:
+        print(f"📚 Indexation plein texte de {len(archive.snapshots)} captures...")
+        start = time.perf_counter()
+        added, removed = archive.fulltext.update(archive, rebuild=rebuild)
+        print(f"✅ {added} pages indexées, {removed} retirées en {time.perf_counter() - start:.1f}s "
+              f"({len(archive.fulltext)} au total dans {archive.fulltext.db_file})")
+    finally:
+        archive.close()
+
+def search_fulltext(base_dir, query, limit=20):
+    """Affiche les captures les plus pertinentes pour une requête"""
+    if not (Path(base_dir) / "fulltext.sqlite").exists():
+        print(f"⚠️  Pas d'index plein texte dans {base_dir} (lancez --build-fulltext)")
+        return []
+    index = FullTextIndex(base_dir)
+    try:
+        results = index.search(query, limit=limit)
+    finally:
+        index.close()
+    print(f"🔎 {len(results)} résultat(s) pour « {query} »")
+    for rank, result in enumerate(results, 1):
+        print(f"{rank:3}. {result['title']}  ({result['score']})")
+        print(f"     {result['url']}")
+        print(f"     📁 {result['snapshot_id']}/index.html")
+        if result['snippet']:
+            print(f"     {result['snippet']}")
+    return results
+
+def show_timeline(base_dir, url, storage='json', when=None):
+    """Affiche les versions capturées d'une URL (ou celle la plus proche d'une date)"""
+    archive = LocalSnapshot(base_dir, storage=storage)
+    try:
+        versions = archive.timeline(url)
+        if not versions:
+            print(f"⚠️  Aucune capture de {url} dans {base_dir}")
+            return []
+        nearest = archive.nearest(url, when) if when else None
+        print(f"🕰️  {len(versions)} version(s) de {versions[0]['url']}")
+        for version in versions:
+            marker = "👉" if nearest is not None and version['snapshot_id'] == nearest['snapshot_id'] else "  "
+            if version.get('keyframe'):
+                storage_mode = f"delta n°{version['delta_depth']}"
+            else:
+                storage_mode = "complète"
+            print(f"{marker} {version['timestamp'][:19].replace('T', ' ')}  "
+                  f"{version.get('content_size', 0) // 1024:5} Ko  "
+                  f"{version.get('stored_size', 0) // 1024:5} Ko stockés ({storage_mode})  "
+                  f"📁 {version['snapshot_id']}/index.html")
+        return versions
+    finally:
+        archive.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Web scraper avec captures locales type Wayback Machine")
+    parser.add_argument('--dir', default="wayback_snapshots", help="dossier de l'archive")
+    parser.add_argument('--storage', choices=sorted(STORAGE_BACKENDS), default='json',
+                        help="format du catalogue des captures (json ou sqlite)")
+    parser.add_argument('--migrate', choices=sorted(STORAGE_BACKENDS),
+                        help="convertit le catalogue existant vers ce format puis quitte")
+    parser.add_argument('--resume', action='store_true',
+                        help="reprend le crawl interrompu enregistré dans l'archive")
+    parser.add_argument('--compress', choices=sorted(COMPRESSIONS),
+                        help="compresse les fichiers de chaque capture (consultation via --serve)")
+    parser.add_argument('--serve', action='store_true',
+                        help="sert l'archive sur un serveur HTTP local puis quitte à l'arrêt")
+    parser.add_argument('--port', type=int, default=8000, help="port du serveur local (défaut: 8000)")
+    parser.add_argument('--index-text', action='store_true',
+                        help="indexe aussi le texte des pages pour la recherche de l'index")
+    parser.add_argument('--fulltext', action='store_true',
+                        help="tient à jour l'index plein texte (fulltext.sqlite) pendant le crawl")
+    parser.add_argument('--build-fulltext', action='store_true',
+                        help="indexe le contenu des captures existantes (plein texte) puis quitte")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="avec --build-fulltext : repart d'un index vide")
+    parser.add_argument('--search', metavar='REQUÊTE',
+                        help="cherche dans l'index plein texte et affiche les captures classées")
+    parser.add_argument('--limit', type=int, default=20, help="nombre de résultats de --search (défaut: 20)")
+    parser.add_argument('--max-size', type=float, default=10,
+                        help="taille maximale d'une page en Mo, au-delà le téléchargement est abandonné (défaut: 10)")
+    parser.add_argument('--requisites', action='store_true',
+                        help="télécharge aussi les CSS, images et scripts des pages pour une consultation hors ligne")
+    parser.add_argument('--offline-links', action='store_true',
+                        help="fait pointer les liens des pages vers leurs captures (ou vers une page "
+                             "« non capturée ») pour naviguer dans l'archive hors ligne")
+    parser.add_argument('--warc', action='store_true',
+                        help="écrit aussi requêtes et réponses brutes dans warc/*.warc.gz (+ index CDX)")
+    parser.add_argument('--warc-size', type=float, default=1000,
+                        help="taille d'un fichier WARC en Mo avant de passer au suivant (défaut: 1000)")
+    parser.add_argument('--deltas', action='store_true',
+                        help="stocke les nouvelles versions d'une page en différences avec une version complète "
+                             "(consultation via --serve)")
+    parser.add_argument('--timeline', metavar='URL',
+                        help="liste les versions capturées d'une URL puis quitte")
+    parser.add_argument('--at', metavar='DATE',
+                        help="avec --timeline : signale la version la plus proche de cette date "
+                             "(2024-05-01T12:00 ou 20240501120000)")
+    parser.add_argument('--recrawl', action='store_true',
+                        help="re-crawl incrémental : requêtes conditionnelles, pas de nouvelle capture "
+                             "pour les pages inchangées")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    
+    if args.migrate:
+        count = migrate_catalog(args.dir, args.migrate)
+        print(f"✅ {count} captures migrées vers le format {args.migrate} dans {args.dir}")
+        return
+    
+    if args.serve:
+        serve_archive(args.dir, args.port)
+        return
+    
+    if args.build_fulltext:
+        build_fulltext_index(args.dir, args.storage, rebuild=args.rebuild)
+        return
+    
+    if args.search:
+        search_fulltext(args.dir, args.search, args.limit)
+        return
+    
+    if args.timeline:
+        show_timeline(args.dir, args.timeline, args.storage, args.at)
+        return
+    
+    print("""
+    🌐 WEB SCRAPER AVEC CAPTURES LOCALES
+    ====================================
+    Ce programme va:
+    1. Scraper les pages web
+    2. Créer des captures HTML locales
+    3. Générer une interface de navigation
+    4. Montrer UNIQUEMENT les liens capturés
+    """)
+    
+    state = load_crawl_state(args.dir) if args.resume else None
+    if args.resume and state is None:
+        print(f"⚠️  Aucun crawl à reprendre dans {args.dir}")
+        return
+    
+    if state is not None:
+        # Reprise : on réutilise la configuration du crawl interrompu
+        start_url = state['start_url']
+        config = state['config']
+        max_depth = config['max_depth']
+        max_pages = config['max_pages']
+        delay = config['delay']
+        workers = config['workers']
+        args.compress = config.get('compression', args.compress)
+        args.index_text = config.get('index_text', args.index_text)
+        args.fulltext = config.get('fulltext', args.fulltext)
+        max_body_size = config.get('max_body_size', int(args.max_size * 1024 * 1024))
+        args.recrawl = config.get('recrawl', args.recrawl)
+        args.deltas = config.get('deltas', args.deltas)
+        args.requisites = config.get('requisites', args.requisites)
+        args.offline_links = config.get('offline_links', args.offline_links)
+        args.warc = config.get('warc', args.warc)
+        warc_max_size = config.get('warc_max_size') or int(args.warc_size * 1024 * 1024)
+    else:
+        # Configuration
+        max_body_size = int(args.max_size * 1024 * 1024)
+        warc_max_size = int(args.warc_size * 1024 * 1024)
+        start_url = input("Entrez l'URL de départ: ").strip()
+        
+        try:
+            max_depth = int(input("Profondeur de crawling (1-4 recommandé): ").strip())
+            max_pages = int(input("Nombre maximum de pages à scraper (10-100): ").strip())
+            delay = float(input("Délai entre deux requêtes vers un même site (secondes, 1-3 recommandé): ").strip())
+            workers = int(input("Nombre de téléchargements simultanés (1-8 recommandé): ").strip())
+        except ValueError:
+            print("⚠️  Utilisation des valeurs par défaut")
+            max_depth = 2
+            max_pages = 20
+            delay = 1
+            workers = 4
+    
+    # Créer et lancer le scraper
+    scraper = WebScraperWithSnapshots(
+        base_dir=args.dir,
+        delay=delay,
+        max_depth=max_depth,
+        max_pages=max_pages,
+        workers=workers,
+        storage=args.storage,
+        compression=args.compress,
+        index_text=args.index_text,
+        fulltext=args.fulltext,
+        max_body_size=max_body_size,
+        recrawl=args.recrawl,
+        deltas=args.deltas,
+        requisites=args.requisites,
+        offline_links=args.offline_links,
+        warc=args.warc,
+        warc_max_size=warc_max_size
+    )
+    
+    scraper.crawl(start_url, resume=args.resume)
+    scraper.snapshot.close()
+    
+    print("\n🎯 Comment utiliser les captures:")
+    if args.compress or args.deltas:
+        print(f"1. Lancez 'python scraper.py --dir {args.dir} --serve' puis ouvrez http://127.0.0.1:{args.port}/index.html")
+    else:
+        print(f"1. Ouvrez '{args.dir}/index.html' dans votre navigateur")
+    print("2. Naviguez entre les captures via l'interface web")
+    print("3. Chaque capture montre UNIQUEMENT les liens déjà capturés")
+    print("4. Plus de liens non-capturés visibles - seulement les disponibles!")
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
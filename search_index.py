@@ -0,0 +1,110 @@
+"""Index de recherche inversé de la page d'index : mot -> captures qui le contiennent
+
+Les mots viennent du titre, de l'URL (hôte et segments du chemin) et, si le
+crawl l'a demandé, du texte des pages. L'index est découpé par les deux
+premières lettres des mots en fichiers data/search-XX.js, chargés à la demande.
+Les préfixes très fréquents sont redécoupés sur 3 ou 4 lettres. La
+normalisation doit rester identique à celle de static/index.js.
+"""
+import json
+import re
+import unicodedata
+from collections import Counter
+from urllib.parse import urlsplit, unquote
+
+TOKEN = re.compile(r'[^\W_]+')
+PREFIX_LENGTH = 2
+# Un fichier trop gros est redécoupé sur un préfixe plus long (jusqu'à 4 lettres)
+MAX_SHARD_POSTINGS = 50000
+MAX_PREFIX_LENGTH = 4
+MIN_TOKEN_LENGTH = 2
+# Mots du texte conservés par capture (les plus fréquents)
+MAX_BODY_TERMS = 300
+
+
+def normalize(text):
+    """Minuscules sans accents (« Été » -> « ete »)"""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in text if not unicodedata.category(c).startswith('M'))
+
+
+def tokenize(text, min_length=MIN_TOKEN_LENGTH):
+    """Découpe un texte en mots normalisés"""
+    return [token for token in TOKEN.findall(normalize(text)) if len(token) >= min_length]
+
+
+def url_terms(url):
+    """Mots de l'hôte et des segments du chemin d'une URL"""
+    parts = urlsplit(url)
+    return tokenize(parts.hostname or '') + tokenize(unquote(parts.path))
+
+
+def body_terms(text, limit=MAX_BODY_TERMS):
+    """Mots les plus fréquents du texte d'une page (au moins 3 lettres)"""
+    counts = Counter(tokenize(text, min_length=3))
+    return [term for term, _ in counts.most_common(limit)]
+
+
+def document_terms(record):
+    """Mots indexés pour une capture du catalogue"""
+    return set(tokenize(record.get('title') or '')) | set(url_terms(record['url'])) | \
+        set(record.get('body_terms', []))
+
+
+def shard_name(prefix):
+    """Nom de fichier sûr pour un préfixe (caractères non ASCII en hexadécimal)"""
+    return ''.join(c if c.isascii() and c.isalnum() else f"_{ord(c):x}" for c in prefix)
+
+
+def _split_shard(prefix, terms, shards):
+    """Range les mots d'un préfixe dans un fichier, ou dans plusieurs s'il est trop gros"""
+    if sum(len(deltas) for deltas in terms.values()) > MAX_SHARD_POSTINGS and len(prefix) < MAX_PREFIX_LENGTH:
+        longer = {}
+        for term, deltas in terms.items():
+            longer.setdefault(term[:len(prefix) + 1], {})[term] = deltas
+        # Si tous les mots sont le préfixe lui-même, on ne peut pas découper plus
+        if list(longer) != [prefix]:
+            for sub_prefix, sub_terms in longer.items():
+                _split_shard(sub_prefix, sub_terms, shards)
+            return
+    shards[prefix] = terms
+
+
+def write_search_index(data_dir, documents):
+    """Écrit l'index inversé en fichiers JSONP data/search-XX.js
+
+    documents : suite de (numéro de capture dans les données de la grille, mots).
+    Les listes de numéros sont triées et codées en écarts successifs.
+    Retourne la partie "search" du manifeste.
+    """
+    postings = {}
+    for number, terms in documents:
+        for term in terms:
+            postings.setdefault(term, []).append(number)
+
+    groups = {}
+    for term in sorted(postings):
+        numbers = sorted(postings[term])
+        deltas = [numbers[0]] + [b - a for a, b in zip(numbers, numbers[1:])]
+        groups.setdefault(term[:PREFIX_LENGTH], {})[term] = deltas
+    shards = {}
+    for prefix, terms in groups.items():
+        _split_shard(prefix, terms, shards)
+
+    written = set()
+    for prefix, terms in shards.items():
+        name = f"search-{shard_name(prefix)}.js"
+        payload = json.dumps(terms, ensure_ascii=False, separators=(',', ':'))
+        with open(data_dir / name, 'w', encoding='utf-8') as f:
+            f.write(f"archiveSearchShardLoaded({json.dumps(prefix)},{payload});\n")
+        written.add(name)
+    for stale in data_dir.glob("search-*.js"):
+        if stale.name not in written:
+            stale.unlink()
+
+    return {
+        'prefix_length': PREFIX_LENGTH,
+        'min_length': MIN_TOKEN_LENGTH,
+        'terms': len(postings),
+        'shards': sorted(shards)
+    }
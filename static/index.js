@@ -0,0 +1,394 @@
+// Les captures arrivent par fichiers data/snapshots-NNNN.js (triés du plus récent
+// au plus ancien) : on ne charge que ce qu'il faut pour la page affichée
+const PAGE_SIZE = 60;
+const SEARCH_DELAY = 200;
+const loadedShards = [];
+const pendingShards = {};
+let loadedCount = 0;
+let currentPage = 0;
+let currentView = null;
+let cachedResults = null;
+let searchTimer = null;
+let renderScheduled = false;
+// Index de recherche inversé : data/search-XX.js, un fichier par préfixe de deux
+// lettres (ou plus pour les préfixes très fréquents)
+const searchShards = {};
+const pendingSearchShards = {};
+const searchPrefixes = archiveManifest.search ? archiveManifest.search.shards : [];
+let cachedSearch = null;
+
+function archiveShardLoaded(index, rows) {
+    loadedShards[index] = rows.map(row => {
+        const snap = {};
+        archiveManifest.fields.forEach((field, i) => { snap[field] = row[i]; });
+        snap.path = `${snap.snapshot_id}/index.html`;
+        // Texte de recherche calculé une fois, pas à chaque frappe
+        snap.haystack = `${snap.url}\n${snap.title}\n${snap.snapshot_id}`.toLowerCase();
+        return snap;
+    });
+    loadedCount++;
+    if (pendingShards[index]) {
+        pendingShards[index].resolve();
+    }
+}
+
+function loadShard(index) {
+    if (loadedShards[index]) {
+        return Promise.resolve();
+    }
+    if (!pendingShards[index]) {
+        let callbacks;
+        const promise = new Promise((resolve, reject) => { callbacks = { resolve, reject }; });
+        pendingShards[index] = Object.assign(promise, callbacks);
+        const script = loadScript(`data/${archiveManifest.shards[index]}`);
+        script.onerror = () => callbacks.reject(new Error(`Impossible de charger ${script.src}`));
+    }
+    return pendingShards[index];
+}
+
+function loadScript(src) {
+    // Balise <script> plutôt que fetch : fonctionne aussi en file://
+    const script = document.createElement('script');
+    script.src = `${src}?v=${archiveManifest.version}`;
+    document.head.appendChild(script);
+    return script;
+}
+
+function archiveSearchShardLoaded(prefix, terms) {
+    searchShards[prefix] = { terms, keys: Object.keys(terms).sort() };
+    if (pendingSearchShards[prefix]) {
+        pendingSearchShards[prefix].resolve();
+    }
+}
+
+function loadSearchShard(prefix) {
+    if (searchShards[prefix]) {
+        return Promise.resolve();
+    }
+    if (!pendingSearchShards[prefix]) {
+        let callbacks;
+        const promise = new Promise((resolve, reject) => { callbacks = { resolve, reject }; });
+        pendingSearchShards[prefix] = Object.assign(promise, callbacks);
+        const script = loadScript(`data/search-${shardName(prefix)}.js`);
+        script.onerror = () => callbacks.reject(new Error(`Impossible de charger ${script.src}`));
+    }
+    return pendingSearchShards[prefix];
+}
+
+// Même normalisation que search_index.py : minuscules, sans accents, lettres et chiffres
+function tokenize(text) {
+    return text.toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '').match(/[\p{L}\p{N}]+/gu) || [];
+}
+
+function shardName(prefix) {
+    return Array.from(prefix).map(c => /[a-z0-9]/.test(c) ? c : '_' + c.codePointAt(0).toString(16)).join('');
+}
+
+async function searchIndex(query) {
+    // Numéros des captures dont un mot commence par chacun des mots de la
+    // requête, ou null si l'index ne peut pas répondre (mot trop court...)
+    const search = archiveManifest.search;
+    const tokens = tokenize(query);
+    if (!search || tokens.length === 0 || tokens.some(t => Array.from(t).length < search.min_length)) {
+        return null;
+    }
+    let matches = null;
+    for (const token of tokens) {
+        const found = new Set();
+        // Fichier dont le préfixe couvre le mot, ou fichiers plus fins qui le prolongent
+        const prefixes = searchPrefixes.filter(p => token.startsWith(p) || p.startsWith(token));
+        await Promise.all(prefixes.map(loadSearchShard));
+        for (const prefix of prefixes) {
+            const shard = searchShards[prefix];
+            // Clés triées : les mots qui commencent par token sont contigus
+            let lo = 0, hi = shard.keys.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (shard.keys[mid] < token) lo = mid + 1; else hi = mid;
+            }
+            for (let i = lo; i < shard.keys.length && shard.keys[i].startsWith(token); i++) {
+                let number = 0;
+                for (const delta of shard.terms[shard.keys[i]]) {
+                    number += delta;
+                    found.add(number);
+                }
+            }
+        }
+        matches = matches === null ? found : new Set([...matches].filter(n => found.has(n)));
+        if (matches.size === 0) break;
+    }
+    return [...matches].sort((a, b) => a - b);
+}
+
+async function indexedSnapshots(view) {
+    // Recherche par l'index : seuls les fichiers de la grille qui contiennent
+    // des résultats sont chargés
+    if (cachedSearch && cachedSearch.key === view.key) {
+        return cachedSearch.results;
+    }
+    const numbers = await searchIndex(view.search);
+    if (numbers === null) {
+        return null;
+    }
+    const size = archiveManifest.shard_size;
+    await Promise.all([...new Set(numbers.map(n => Math.floor(n / size)))].map(i => loadShard(i)));
+    const results = numbers
+        .map(n => loadedShards[Math.floor(n / size)][n % size])
+        .filter(s => !view.domain || s.domain === view.domain);
+    sortSnapshots(results, view.sort);
+    cachedSearch = { key: view.key, results };
+    return results;
+}
+
+function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, c => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[c]);
+}
+
+function setStatus(text) {
+    document.getElementById('index-status').textContent = text;
+}
+
+function scheduleFilter() {
+    // Recherche différée : on attend une pause dans la frappe
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => filterSnapshots(), SEARCH_DELAY);
+}
+
+async function filterSnapshots() {
+    clearTimeout(searchTimer);
+    currentPage = 0;
+    await showPage();
+}
+
+async function showPage() {
+    const search = document.getElementById('search').value.trim().toLowerCase();
+    const domain = document.getElementById('domain-filter').value;
+    const sort = document.getElementById('sort').value;
+    const view = { search, domain, sort, key: `${sort}\u0000${domain}\u0000${search}` };
+    currentView = view;
+    const shardCount = archiveManifest.shards.length;
+
+    // Vue par défaut : l'ordre des fichiers est déjà le bon, seuls ceux
+    // qui couvrent la page demandée sont nécessaires
+    if (!search && !domain && sort === 'newest') {
+        const first = Math.floor(currentPage * PAGE_SIZE / archiveManifest.shard_size);
+        const last = Math.min(shardCount - 1,
+            Math.floor(((currentPage + 1) * PAGE_SIZE - 1) / archiveManifest.shard_size));
+        for (let i = first; i <= last; i++) {
+            await loadShard(i);
+        }
+        if (currentView !== view) return;
+        const offset = currentPage * PAGE_SIZE - first * archiveManifest.shard_size;
+        const rows = [].concat(...loadedShards.slice(first, last + 1)).slice(offset, offset + PAGE_SIZE);
+        setStatus('');
+        renderSnapshots(rows, archiveManifest.total);
+        return;
+    }
+
+    // Recherche par l'index inversé quand c'est possible
+    if (search) {
+        const results = await indexedSnapshots(view);
+        if (currentView !== view) return;
+        if (results !== null) {
+            setStatus('');
+            const start = currentPage * PAGE_SIZE;
+            renderSnapshots(results.slice(start, start + PAGE_SIZE), results.length);
+            return;
+        }
+    }
+
+    // Filtre, autre tri ou recherche hors index : il faut toutes les captures. Les fichiers
+    // manquants sont demandés en parallèle, l'affichage suit leur arrivée
+    renderFiltered(view);
+    if (loadedCount < shardCount) {
+        await Promise.all(archiveManifest.shards.map((_, i) => loadShard(i).then(() => scheduleRender(view))));
+        if (currentView !== view) return;
+        renderFiltered(view);
+    }
+}
+
+function scheduleRender(view) {
+    // Au plus un rendu par image pendant le chargement
+    if (renderScheduled) return;
+    renderScheduled = true;
+    const render = () => {
+        renderScheduled = false;
+        if (currentView === view) renderFiltered(view);
+    };
+    if (typeof requestAnimationFrame === 'function') {
+        requestAnimationFrame(render);
+    } else {
+        setTimeout(render, 16);
+    }
+}
+
+function filteredSnapshots(view) {
+    // Résultat réutilisé tant que les critères et les données chargées ne changent pas
+    // (changement de page notamment)
+    if (cachedResults && cachedResults.key === view.key && cachedResults.loadedCount === loadedCount) {
+        return cachedResults.results;
+    }
+    // Saisie qui prolonge la précédente : on affine le résultat déjà trié
+    const previous = cachedResults;
+    if (previous && previous.loadedCount === loadedCount && previous.domain === view.domain &&
+        previous.sort === view.sort && view.search.startsWith(previous.search)) {
+        const results = previous.results.filter(s => s.haystack.includes(view.search));
+        cachedResults = { ...view, loadedCount, results };
+        return results;
+    }
+
+    const results = [];
+    for (const shard of loadedShards) {
+        if (!shard) continue;
+        for (const s of shard) {
+            if ((!view.domain || s.domain === view.domain) &&
+                (!view.search || s.haystack.includes(view.search))) {
+                results.push(s);
+            }
+        }
+    }
+
+    sortSnapshots(results, view.sort);
+    cachedResults = { ...view, loadedCount, results };
+    return results;
+}
+
+function sortSnapshots(results, sort) {
+    // Les dates ISO se comparent comme des chaînes
+    if (sort === 'newest') {
+        results.sort((a, b) => (a.timestamp < b.timestamp ? 1 : a.timestamp > b.timestamp ? -1 : 0));
+    } else if (sort === 'oldest') {
+        results.sort((a, b) => (a.timestamp < b.timestamp ? -1 : a.timestamp > b.timestamp ? 1 : 0));
+    } else if (sort === 'domain') {
+        results.sort((a, b) => (a.domain < b.domain ? -1 : a.domain > b.domain ? 1 : 0));
+    } else if (sort === 'links') {
+        results.sort((a, b) => (b.links_captured_count || 0) - (a.links_captured_count || 0));
+    }
+}
+
+function renderFiltered(view) {
+    const results = filteredSnapshots(view);
+    const shardCount = archiveManifest.shards.length;
+    setStatus(loadedCount < shardCount ? `⏳ Chargement des captures (${loadedCount}/${shardCount})...` : '');
+    const start = currentPage * PAGE_SIZE;
+    renderSnapshots(results.slice(start, start + PAGE_SIZE), results.length);
+}
+
+function renderSnapshots(snapshots, total) {
+    const container = document.getElementById('snapshot-container');
+
+    const cards = snapshots.map(snap => {
+        const date = new Date(snap.timestamp);
+        const capturedCount = snap.links_captured_count || 0;
+        const totalLinks = snap.links_found || 0;
+        const coverage = totalLinks > 0 ? Math.round((capturedCount / totalLinks) * 100) : 0;
+        const url = escapeHtml(snap.url);
+
+        // Préparer la preview des liens (les 3 premiers liens capturés)
+        let linksPreview = '';
+        if (snap.preview && snap.preview.length > 0) {
+            linksPreview = '<div class="links-preview">';
+            snap.preview.forEach(([linkUrl, snapshotId]) => {
+                const truncated = linkUrl.length > 50 ? linkUrl.substring(0, 50) + '...' : linkUrl;
+                linksPreview += `
+                    <div class="link-preview-item">
+                        <span><span class="link-status-dot captured"></span>${escapeHtml(truncated)}</span>
+                        <a href="${escapeHtml(snapshotId)}/index.html" target="_blank" style="color: #3b82f6; font-size: 10px;">
+                            <i class="fas fa-external-link-alt"></i>
+                        </a>
+                    </div>
+                `;
+            });
+            if (capturedCount > 3) {
+                linksPreview += `<div style="text-align: center; color: #6b7280; font-size: 11px; padding: 5px;">
+                    + ${capturedCount - 3} autres liens...
+                </div>`;
+            }
+            linksPreview += '</div>';
+        }
+
+        return `
+            <div class="snapshot-card">
+                <div class="card-header">
+                    <span class="domain-badge">${escapeHtml(snap.domain)}</span>
+                    <div class="timestamp">${date.toLocaleString('fr-FR')}</div>
+                </div>
+                <div class="card-body">
+                    <div class="url" title="${url}">
+                        ${escapeHtml(snap.url.length > 60 ? snap.url.substring(0, 60) + '...' : snap.url)}
+                    </div>
+
+                    <div class="link-stats">
+                        <div class="link-stat captured">
+                            <i class="fas fa-link"></i>
+                            <span>${capturedCount} capturés</span>
+                        </div>
+                        <div class="link-stat available">
+                            <i class="fas fa-external-link-alt"></i>
+                            <span>${totalLinks} trouvés</span>
+                        </div>
+                        ${coverage > 0 ? `
+                        <div class="link-stat coverage">
+                            <i class="fas fa-chart-line"></i>
+                            <span>${coverage}% couverture</span>
+                        </div>` : ''}
+                    </div>
+
+                    ${linksPreview}
+
+                    <div style="font-size: 12px; color: #7f8c8d; margin-top: 10px;">
+                        ID: ${escapeHtml(snap.snapshot_id)}
+                    </div>
+                </div>
+                <div class="card-footer">
+                    <div>
+                        <a href="${escapeHtml(snap.path)}" class="btn btn-view" target="_blank">
+                            <i class="fas fa-eye"></i> Voir
+                        </a>
+                        <a href="${escapeHtml(snap.path.replace('index.html', 'original.html'))}"
+                           class="btn btn-original" target="_blank">
+                            <i class="fas fa-code"></i> Original
+                        </a>
+                        ${capturedCount > 0 ? `
+                        <a href="${escapeHtml(snap.path)}" class="btn btn-links" target="_blank">
+                            <i class="fas fa-sitemap"></i> Liens (${capturedCount})
+                        </a>` : ''}
+                    </div>
+                </div>
+            </div>
+        `;
+    });
+    container.innerHTML = cards.join('');
+    renderPagination(total);
+}
+
+function renderPagination(total) {
+    const pages = Math.max(1, Math.ceil(total / PAGE_SIZE));
+    const pagination = document.getElementById('pagination');
+    pagination.innerHTML = `
+        <button id="prev-page" ${currentPage === 0 ? 'disabled' : ''}>⬅️ Précédent</button>
+        <span>Page ${currentPage + 1} / ${pages} (${total} captures)</span>
+        <button id="next-page" ${currentPage + 1 >= pages ? 'disabled' : ''}>Suivant ➡️</button>
+    `;
+    document.getElementById('prev-page').onclick = () => { currentPage--; showPage(); window.scrollTo(0, 0); };
+    document.getElementById('next-page').onclick = () => { currentPage++; showPage(); window.scrollTo(0, 0); };
+}
+
+function fillDomainFilter() {
+    // Tous les domaines sont dans le manifeste, sans charger les captures
+    const domainSelect = document.getElementById('domain-filter');
+    archiveManifest.domains.forEach(domain => {
+        const option = document.createElement('option');
+        option.value = domain;
+        option.textContent = domain;
+        domainSelect.appendChild(option);
+    });
+}
+
+// Initialisation
+document.addEventListener('DOMContentLoaded', () => {
+    fillDomainFilter();
+    filterSnapshots().catch(e => setStatus(`❌ ${e.message}`));
+});
@@ -0,0 +1,64 @@
+// Filtre des liens (textes lus une seule fois, pas à chaque frappe)
+let linkEntries = null;
+
+function filterLinks() {
+    const searchTerm = document.querySelector('.links-search').value.toLowerCase();
+    if (linkEntries === null) {
+        linkEntries = Array.from(document.querySelectorAll('.link-item'), link =>
+            [link, link.querySelector('.link-url').textContent.toLowerCase()]);
+    }
+
+    let visibleCount = 0;
+    linkEntries.forEach(([link, url]) => {
+        const display = url.includes(searchTerm) ? 'block' : 'none';
+        if (link.style.display !== display) {
+            link.style.display = display;
+        }
+        if (display === 'block') {
+            visibleCount++;
+        }
+    });
+
+    // Mettre à jour le titre avec le nombre de résultats
+    const panelTitle = document.querySelector('.panel-title span');
+    if (panelTitle) {
+        panelTitle.textContent = `Liens disponibles (${visibleCount})`;
+    }
+}
+
+// Masquer le loading overlay quand l'iframe est chargée
+function hideLoadingOverlay() {
+    document.querySelector('.loading-overlay').style.opacity = '0';
+    setTimeout(() => {
+        document.querySelector('.loading-overlay').style.display = 'none';
+    }, 500);
+}
+
+const pageFrame = document.getElementById('page-frame');
+pageFrame.addEventListener('load', hideLoadingOverlay);
+// Ce script est externe : l'iframe a pu finir de charger avant lui
+try {
+    if (pageFrame.contentDocument && pageFrame.contentDocument.readyState === 'complete'
+            && pageFrame.contentDocument.URL !== 'about:blank') {
+        hideLoadingOverlay();
+    }
+} catch (e) {
+    // Accès refusé (file:// dans certains navigateurs) : l'évènement load suffira
+}
+setTimeout(hideLoadingOverlay, 5000);
+
+// Initialiser
+document.addEventListener('DOMContentLoaded', () => {
+    // Ajouter un effet de hover sur les liens
+    document.querySelectorAll('.link-item').forEach(item => {
+        item.addEventListener('click', function(e) {
+            if (!e.target.classList.contains('link-url')) return;
+
+            // Animation de sélection
+            document.querySelectorAll('.link-item').forEach(i => {
+                i.style.background = '';
+            });
+            this.style.background = 'rgba(255, 255, 255, 0.15)';
+        });
+    });
+});
@@ -0,0 +1,583 @@
+"""Stockage de l'archive : catalogue des captures (index.json + journal, ou base
+SQLite) et contenus dédupliqués"""
+import gzip
+import hashlib
+import bisect
+import json
+import os
+import shutil
+import sqlite3
+from collections.abc import MutableMapping
+from pathlib import Path
+
+from timeline import DELTA_SUFFIX, apply_delta, decode_delta
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Modes de compression des fichiers de l'archive -> extension ajoutée au nom
+COMPRESSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def available_compressions():
+    return [name for name in COMPRESSIONS if name != 'zstd' or zstandard is not None]
+
+
+def compress_bytes(data, method):
+    """Compresse de façon déterministe (même entrée -> mêmes octets)"""
+    if method == 'gzip':
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if method == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Le module zstandard n'est pas installé (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    raise ValueError(f"Compression inconnue: {method}")
+
+
+def decompress_bytes(data, method):
+    if method == 'gzip':
+        return gzip.decompress(data)
+    if method == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Le module zstandard n'est pas installé (pip install zstandard)")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Compression inconnue: {method}")
+
+
+def compression_of(path):
+    """Mode de compression d'après l'extension du fichier (None si non compressé)"""
+    for method, suffix in COMPRESSIONS.items():
+        if str(path).endswith(suffix):
+            return method
+    return None
+
+
+class JsonSnapshotStore(MutableMapping):
+    """Catalogue en mémoire, persisté dans index.json et un journal JSONL"""
+    name = 'json'
+
+    def __init__(self, base_dir, compact_every=500):
+        self.base_dir = Path(base_dir)
+        self.index_file = self.base_dir / "index.json"
+        # Journal en ajout seul : une ligne JSON par capture enregistrée depuis la
+        # dernière compaction dans index.json
+        self.journal_file = self.base_dir / "index.journal.jsonl"
+        self.compact_every = compact_every
+        self.journal_entries = 0
+        self.records = {}
+        self.url_index = {}  # url -> snapshot_id
+        self.versions = {}  # url -> snapshot_ids de ses captures, de la plus ancienne à la plus récente
+        self.backlinks = {}  # url -> snapshot_ids des pages qui pointent vers elle
+        self.load()
+
+    def load(self):
+        """Charge index.json puis rejoue le journal par-dessus"""
+        self.records = {}
+        if self.index_file.exists():
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.records = json.load(f)
+        self.journal_entries = self._replay_journal()
+        self.rebuild_url_index()
+
+    def _replay_journal(self):
+        """Applique les entrées du journal ; tronque une éventuelle dernière ligne incomplète"""
+        if not self.journal_file.exists():
+            return 0
+        entries = 0
+        valid_size = 0
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("ligne incomplète")
+                    record = json.loads(line)
+                except ValueError:
+                    # Écriture interrompue par un arrêt brutal : on ignore la fin
+                    print(f"⚠️  Journal tronqué après {entries} entrées, fin ignorée")
+                    break
+                self.records[record['snapshot_id']] = record
+                entries += 1
+                valid_size += len(line)
+        if valid_size < self.journal_file.stat().st_size:
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(valid_size)
+        return entries
+
+    def rebuild_url_index(self):
+        """Reconstruit l'index url -> snapshot_id (la première capture d'une URL fait foi),
+        les versions de chaque URL et l'index inverse des liens"""
+        self.url_index = {}
+        self.versions = {}
+        self.backlinks = {}
+        for snap_id, snap_data in self.records.items():
+            self.url_index.setdefault(snap_data['url'], snap_id)
+            self._add_version(snap_id, snap_data)
+            self._add_backlinks(snap_id, snap_data)
+
+    def _add_version(self, snapshot_id, record):
+        """Range la capture dans la liste chronologique de son URL (ajout en fin le plus souvent)"""
+        versions = self.versions.setdefault(record['url'], [])
+        if snapshot_id in versions:
+            return
+        timestamps = [self.records[snap_id].get('timestamp', '') for snap_id in versions]
+        versions.insert(bisect.bisect_right(timestamps, record.get('timestamp', '')), snapshot_id)
+
+    def _add_backlinks(self, snapshot_id, record):
+        for link in set(record.get('links_available', [])):
+            self.backlinks.setdefault(link, set()).add(snapshot_id)
+
+    # Interface dictionnaire
+    def __getitem__(self, snapshot_id):
+        return self.records[snapshot_id]
+
+    def __setitem__(self, snapshot_id, record):
+        self.records[snapshot_id] = record
+        self.url_index.setdefault(record['url'], snapshot_id)
+        self._add_version(snapshot_id, record)
+        self._add_backlinks(snapshot_id, record)
+        self.append_journal(record)
+
+    def __delitem__(self, snapshot_id):
+        del self.records[snapshot_id]
+        self.rebuild_url_index()
+        # Le journal ne sait pas représenter une suppression : on compacte
+        self.flush()
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, snapshot_id):
+        return snapshot_id in self.records
+
+    def values(self):
+        return self.records.values()
+
+    def items(self):
+        return self.records.items()
+
+    def find_by_url(self, url):
+        """Retourne {snapshot_id, title, domain} de la capture d'une URL, ou None"""
+        snap_id = self.url_index.get(url)
+        if snap_id is None:
+            return None
+        snap_data = self.records[snap_id]
+        return {'snapshot_id': snap_id, 'title': snap_data.get('title', ''), 'domain': snap_data.get('domain')}
+
+    def latest_by_url(self, url):
+        """Capture la plus récente d'une URL (métadonnées complètes), ou None"""
+        versions = self.versions.get(url)
+        return self.records[versions[-1]] if versions else None
+
+    def versions_of(self, url):
+        """Toutes les captures d'une URL, de la plus ancienne à la plus récente"""
+        return [self.records[snap_id] for snap_id in self.versions.get(url, ())]
+
+    def linking_to(self, url):
+        """IDs des captures dont la page contient un lien vers url"""
+        return {snap_id for snap_id in self.backlinks.get(url, ()) if snap_id in self.records}
+
+    def filter(self, domain=None, since=None, until=None):
+        """Captures d'un domaine et/ou d'une période (timestamps ISO)"""
+        for snap_data in self.records.values():
+            if domain is not None and snap_data.get('domain') != domain:
+                continue
+            if since is not None and snap_data['timestamp'] < since:
+                continue
+            if until is not None and snap_data['timestamp'] > until:
+                continue
+            yield snap_data
+
+    def stats(self):
+        """Statistiques globales du catalogue"""
+        unique_blobs = {}  # blob -> (taille d'origine, taille stockée)
+        for snap_data in self.records.values():
+            if snap_data.get('content_sha256'):
+                size = snap_data.get('content_size', 0)
+                unique_blobs[snap_data['blob']] = (size, snap_data.get('stored_size', size))
+        return {
+            'snapshots': len(self.records),
+            'domains': len(set(s.get('domain') for s in self.records.values())),
+            'links_found': sum(s.get('links_found', 0) for s in self.records.values()),
+            'links_captured': sum(s.get('links_captured_count', 0) for s in self.records.values()),
+            'content_bytes': sum(s.get('content_size', 0) for s in self.records.values()
+                                 if s.get('content_sha256')),
+            'unique_bytes': sum(size for size, _ in unique_blobs.values()),
+            'stored_bytes': sum(stored for _, stored in unique_blobs.values())
+        }
+
+    def refresh_captured_links(self):
+        """Met à jour la liste des liens capturés pour chaque snapshot"""
+        for snap_data in self.records.values():
+            captured_links = []
+
+            # Vérifie quels liens de cette page ont été capturés
+            for link in snap_data.get('links_available', []):
+                other_id = self.url_index.get(link)
+                if other_id is not None:
+                    other_snap = self.records[other_id]
+                    captured_links.append({
+                        'url': link,
+                        'snapshot_id': other_snap['snapshot_id'],
+                        'title': other_snap.get('title', ''),
+                        'domain': other_snap['domain']
+                    })
+
+            # Met à jour les données
+            snap_data['links_captured'] = captured_links
+            snap_data['links_captured_count'] = len(captured_links)
+
+        self.flush()
+
+    def replace_all(self, records):
+        """Remplace tout le catalogue (utilisé par la migration)"""
+        self.records = {r['snapshot_id']: r for r in records}
+        self.rebuild_url_index()
+        self.flush()
+
+    def append_journal(self, record):
+        """Ajoute une capture au journal, O(1) par page"""
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.journal_entries += 1
+        # Seuil proportionnel à la taille de l'index : coût amorti constant par page
+        if self.journal_entries >= max(self.compact_every, len(self.records)):
+            self.flush()
+
+    def flush(self):
+        """Compacte : réécrit index.json complet (renommage atomique) et vide le journal"""
+        tmp_file = self.index_file.with_name(self.index_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.index_file)
+        # Un arrêt entre le renommage et la troncature est sans danger :
+        # rejouer le journal sur le nouvel index donne le même résultat
+        if self.journal_file.exists():
+            with open(self.journal_file, 'w', encoding='utf-8'):
+                pass
+        self.journal_entries = 0
+
+    def close(self):
+        pass
+
+
+class SqliteSnapshotStore(MutableMapping):
+    """Catalogue dans une base SQLite indexée (url, domaine, date, titre, graphe de liens)"""
+    name = 'sqlite'
+    COLUMNS = ('snapshot_id', 'url', 'domain', 'timestamp', 'title', 'links_found', 'links_captured_count')
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            snapshot_id TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            domain TEXT,
+            timestamp TEXT,
+            title TEXT,
+            links_found INTEGER NOT NULL DEFAULT 0,
+            links_captured_count INTEGER NOT NULL DEFAULT 0,
+            extra TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE INDEX IF NOT EXISTS idx_snapshots_url ON snapshots(url);
+        CREATE INDEX IF NOT EXISTS idx_snapshots_domain ON snapshots(domain, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_snapshots_timestamp ON snapshots(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_snapshots_title ON snapshots(title);
+        CREATE TABLE IF NOT EXISTS links_available (
+            snapshot_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            PRIMARY KEY (snapshot_id, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_links_available_url ON links_available(url);
+        CREATE TABLE IF NOT EXISTS links_captured (
+            snapshot_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            target_id TEXT NOT NULL,
+            PRIMARY KEY (snapshot_id, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_links_captured_target ON links_captured(target_id);
+    """
+
+    def __init__(self, base_dir):
+        self.db_file = Path(base_dir) / "index.sqlite"
+        self.conn = sqlite3.connect(self.db_file)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def _row_to_record(self, row):
+        """Reconstruit le dictionnaire d'une capture (même forme que dans index.json)"""
+        record = json.loads(row['extra'])
+        for column in self.COLUMNS:
+            record[column] = row[column]
+        snap_id = row['snapshot_id']
+        record['links_available'] = [r[0] for r in self.conn.execute(
+            "SELECT url FROM links_available WHERE snapshot_id = ? ORDER BY position", (snap_id,))]
+        record['links_captured'] = [
+            {'url': r['url'], 'snapshot_id': r['target_id'], 'title': r['title'] or '', 'domain': r['domain']}
+            for r in self.conn.execute(
+                "SELECT lc.url, lc.target_id, s.title, s.domain FROM links_captured lc "
+                "JOIN snapshots s ON s.snapshot_id = lc.target_id "
+                "WHERE lc.snapshot_id = ? ORDER BY lc.position", (snap_id,))
+        ]
+        return record
+
+    def _write(self, record):
+        """Insère ou met à jour une capture (sans commit)"""
+        snap_id = record['snapshot_id']
+        extra = {k: v for k, v in record.items()
+                 if k not in self.COLUMNS and k not in ('links_available', 'links_captured')}
+        links = record.get('links_available', [])
+        captured = record.get('links_captured')
+        values = (snap_id, record['url'], record.get('domain'), record.get('timestamp'),
+                  record.get('title'), record.get('links_found', len(links)),
+                  record.get('links_captured_count', len(captured or [])),
+                  json.dumps(extra, ensure_ascii=False))
+        # UPSERT plutôt que REPLACE : conserve le rowid, donc l'ordre de capture
+        self.conn.execute(
+            "INSERT INTO snapshots (snapshot_id, url, domain, timestamp, title, links_found, "
+            "links_captured_count, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(snapshot_id) DO UPDATE SET url = excluded.url, domain = excluded.domain, "
+            "timestamp = excluded.timestamp, title = excluded.title, links_found = excluded.links_found, "
+            "links_captured_count = excluded.links_captured_count, extra = excluded.extra", values)
+        self.conn.execute("DELETE FROM links_available WHERE snapshot_id = ?", (snap_id,))
+        self.conn.executemany(
+            "INSERT INTO links_available (snapshot_id, position, url) VALUES (?, ?, ?)",
+            ((snap_id, i, link) for i, link in enumerate(links)))
+        if captured is not None:
+            self.conn.execute("DELETE FROM links_captured WHERE snapshot_id = ?", (snap_id,))
+            self.conn.executemany(
+                "INSERT INTO links_captured (snapshot_id, position, url, target_id) VALUES (?, ?, ?, ?)",
+                ((snap_id, i, link['url'], link['snapshot_id']) for i, link in enumerate(captured)))
+
+    # Interface dictionnaire
+    def __getitem__(self, snapshot_id):
+        row = self.conn.execute("SELECT * FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)).fetchone()
+        if row is None:
+            raise KeyError(snapshot_id)
+        return self._row_to_record(row)
+
+    def __setitem__(self, snapshot_id, record):
+        with self.conn:
+            self._write(dict(record, snapshot_id=snapshot_id))
+
+    def __delitem__(self, snapshot_id):
+        if snapshot_id not in self:
+            raise KeyError(snapshot_id)
+        with self.conn:
+            for table in ('snapshots', 'links_available', 'links_captured'):
+                self.conn.execute(f"DELETE FROM {table} WHERE snapshot_id = ?", (snapshot_id,))
+            self.conn.execute("DELETE FROM links_captured WHERE target_id = ?", (snapshot_id,))
+
+    def __iter__(self):
+        for row in self.conn.execute("SELECT snapshot_id FROM snapshots ORDER BY rowid"):
+            yield row[0]
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+    def __contains__(self, snapshot_id):
+        return self.conn.execute(
+            "SELECT 1 FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)).fetchone() is not None
+
+    def values(self):
+        for row in self.conn.execute("SELECT * FROM snapshots ORDER BY rowid"):
+            yield self._row_to_record(row)
+
+    def items(self):
+        for record in self.values():
+            yield record['snapshot_id'], record
+
+    def find_by_url(self, url):
+        """Retourne {snapshot_id, title, domain} de la capture d'une URL, ou None"""
+        row = self.conn.execute(
+            "SELECT snapshot_id, title, domain FROM snapshots WHERE url = ? ORDER BY rowid LIMIT 1",
+            (url,)).fetchone()
+        if row is None:
+            return None
+        return {'snapshot_id': row['snapshot_id'], 'title': row['title'] or '', 'domain': row['domain']}
+
+    def latest_by_url(self, url):
+        """Capture la plus récente d'une URL (métadonnées complètes), ou None"""
+        row = self.conn.execute(
+            "SELECT * FROM snapshots WHERE url = ? ORDER BY timestamp DESC, rowid DESC LIMIT 1",
+            (url,)).fetchone()
+        return self._row_to_record(row) if row is not None else None
+
+    def versions_of(self, url):
+        """Toutes les captures d'une URL, de la plus ancienne à la plus récente"""
+        return [self._row_to_record(row) for row in self.conn.execute(
+            "SELECT * FROM snapshots WHERE url = ? ORDER BY timestamp, rowid", (url,)).fetchall()]
+
+    def linking_to(self, url):
+        """IDs des captures dont la page contient un lien vers url (index sur links_available.url)"""
+        return {row[0] for row in self.conn.execute(
+            "SELECT DISTINCT snapshot_id FROM links_available WHERE url = ?", (url,))}
+
+    def filter(self, domain=None, since=None, until=None):
+        """Captures d'un domaine et/ou d'une période (timestamps ISO)"""
+        clauses, params = [], []
+        if domain is not None:
+            clauses.append("domain = ?")
+            params.append(domain)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        for row in self.conn.execute(f"SELECT * FROM snapshots {where} ORDER BY timestamp", params):
+            yield self._row_to_record(row)
+
+    def stats(self):
+        """Statistiques globales du catalogue"""
+        row = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT domain), COALESCE(SUM(links_found), 0), "
+            "COALESCE(SUM(links_captured_count), 0) FROM snapshots").fetchone()
+        content = self.conn.execute("""
+            SELECT COALESCE(SUM(size), 0), COALESCE(SUM(unique_size), 0), COALESCE(SUM(stored_size), 0) FROM (
+                SELECT SUM(json_extract(extra, '$.content_size')) AS size,
+                       MAX(json_extract(extra, '$.content_size')) AS unique_size,
+                       MAX(COALESCE(json_extract(extra, '$.stored_size'),
+                                    json_extract(extra, '$.content_size'))) AS stored_size
+                FROM snapshots WHERE json_extract(extra, '$.content_sha256') IS NOT NULL
+                GROUP BY json_extract(extra, '$.blob'))
+        """).fetchone()
+        return {'snapshots': row[0], 'domains': row[1], 'links_found': row[2], 'links_captured': row[3],
+                'content_bytes': content[0], 'unique_bytes': content[1], 'stored_bytes': content[2]}
+
+    def refresh_captured_links(self):
+        """Recalcule le graphe des liens capturés en une seule requête"""
+        with self.conn:
+            self.conn.execute("DELETE FROM links_captured")
+            self.conn.execute("""
+                INSERT INTO links_captured (snapshot_id, position, url, target_id)
+                SELECT snapshot_id, position, url, target_id FROM (
+                    SELECT la.snapshot_id, la.position, la.url,
+                           (SELECT s.snapshot_id FROM snapshots s WHERE s.url = la.url
+                            ORDER BY s.rowid LIMIT 1) AS target_id
+                    FROM links_available la
+                ) WHERE target_id IS NOT NULL
+            """)
+            self.conn.execute("""
+                UPDATE snapshots SET links_captured_count = (
+                    SELECT COUNT(*) FROM links_captured lc WHERE lc.snapshot_id = snapshots.snapshot_id)
+            """)
+
+    def replace_all(self, records):
+        """Remplace tout le catalogue en une transaction (utilisé par la migration)"""
+        with self.conn:
+            for table in ('snapshots', 'links_available', 'links_captured'):
+                self.conn.execute(f"DELETE FROM {table}")
+            for record in records:
+                self._write(record)
+
+    def flush(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class BlobStore:
+    """Contenus adressés par leur SHA-256 : des octets identiques ne sont stockés qu'une fois"""
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path_for(self, digest, suffix='.html'):
+        return self.root / digest[:2] / f"{digest}{suffix}"
+
+    def find(self, digest, suffix='.html'):
+        """Chemin du blob complet d'un contenu, compressé ou non, ou None"""
+        for extension in ('', *COMPRESSIONS.values()):
+            path = self.path_for(digest, suffix + extension)
+            if path.exists():
+                return path
+        return None
+
+    def put(self, data, suffix='.html', compression=None):
+        """Stocke les octets s'ils sont nouveaux ; retourne (sha256, chemin du blob)
+        
+        L'empreinte porte sur le contenu non compressé, le fichier stocké est
+        compressé si demandé (extension .gz ou .zst).
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        if compression:
+            suffix += COMPRESSIONS[compression]
+        path = self.path_for(digest, suffix)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(compress_bytes(data, compression) if compression else data)
+            os.replace(tmp_path, path)
+        return digest, path
+
+    def read(self, path):
+        """Relit un blob en le décompressant si besoin ; un delta est
+        reconstruit à partir de sa keyframe"""
+        data = Path(path).read_bytes()
+        method = compression_of(path)
+        if method:
+            data = decompress_bytes(data, method)
+        if DELTA_SUFFIX in Path(path).suffixes:
+            base_sha256, ops = decode_delta(data)
+            base_path = self.find(base_sha256)
+            if base_path is None:
+                raise FileNotFoundError(f"Keyframe {base_sha256} introuvable pour le delta {path}")
+            return apply_delta(self.read(base_path).decode('utf-8'), ops).encode('utf-8')
+        return data
+
+    def link(self, blob_path, target):
+        """Fait pointer target vers le blob : lien physique, sinon symbolique, sinon copie"""
+        target = Path(target)
+        if target.exists() or target.is_symlink():
+            target.unlink()
+        try:
+            os.link(blob_path, target)
+            return 'hardlink'
+        except OSError:
+            pass
+        try:
+            os.symlink(os.path.relpath(blob_path, target.parent), target)
+            return 'symlink'
+        except OSError:
+            shutil.copyfile(blob_path, target)
+            return 'copy'
+
+
+STORAGE_BACKENDS = {
+    'json': JsonSnapshotStore,
+    'sqlite': SqliteSnapshotStore,
+}
+
+
+def open_store(base_dir, storage='json', **options):
+    """Ouvre le catalogue d'une archive avec le backend demandé"""
+    if storage not in STORAGE_BACKENDS:
+        raise ValueError(f"Stockage inconnu: {storage} (choix: {', '.join(STORAGE_BACKENDS)})")
+    if storage == 'json':
+        return JsonSnapshotStore(base_dir, **options)
+    return SqliteSnapshotStore(base_dir)
+
+
+def migrate_catalog(base_dir, target):
+    """Copie le catalogue d'une archive vers l'autre format (json <-> sqlite)"""
+    source_name = 'json' if target == 'sqlite' else 'sqlite'
+    if source_name == 'sqlite' and not (Path(base_dir) / "index.sqlite").exists():
+        raise FileNotFoundError(f"Aucune base index.sqlite dans {base_dir}")
+    source = open_store(base_dir, source_name)
+    destination = open_store(base_dir, target)
+    try:
+        destination.replace_all(source.values())
+        return len(destination)
+    finally:
+        source.close()
+        destination.close()
@@ -0,0 +1,74 @@
+"""Mini moteur de gabarits HTML : compilés une fois, rendus avec échappement
+
+Syntaxe : {{ champ }} insère la valeur échappée, {{ champ|safe }} l'insère
+telle quelle (fragments HTML déjà rendus, données JSON).
+"""
+import json
+import re
+from html import escape
+from pathlib import Path
+
+PLACEHOLDER = re.compile(r'\{\{\s*(\w+)(\|safe)?\s*\}\}')
+
+
+class Template:
+    """Gabarit compilé en une fonction Python qui concatène des morceaux"""
+    def __init__(self, source, name='<template>'):
+        self.name = name
+        self.fields = []
+        namespace = {'_escape': escape, '_str': str}
+        parts = []
+        position = 0
+        for match in PLACEHOLDER.finditer(source):
+            self._add_static(source[position:match.start()], parts, namespace)
+            field, safe = match.group(1), match.group(2)
+            self.fields.append(field)
+            parts.append(f"_str(ctx[{field!r}])" if safe else f"_escape(_str(ctx[{field!r}]))")
+            position = match.end()
+        self._add_static(source[position:], parts, namespace)
+
+        # Les morceaux statiques sont des constantes du module généré
+        code = f"def render(ctx):\n    return ''.join(({', '.join(parts)},))\n" if parts else \
+            "def render(ctx):\n    return ''\n"
+        exec(compile(code, f"<template {name}>", 'exec'), namespace)
+        self._render = namespace['render']
+
+    @staticmethod
+    def _add_static(text, parts, namespace):
+        if text:
+            constant = f"_static{len(namespace)}"
+            namespace[constant] = text
+            parts.append(constant)
+
+    def render(self, context):
+        """Rend le gabarit avec un dictionnaire de valeurs"""
+        try:
+            return self._render(context)
+        except KeyError as e:
+            raise KeyError(f"Gabarit {self.name}: valeur manquante {e}") from None
+
+    def render_many(self, contexts):
+        """Rend le gabarit pour une suite de contextes et concatène les résultats"""
+        render = self._render
+        try:
+            return ''.join(map(render, contexts))
+        except KeyError as e:
+            raise KeyError(f"Gabarit {self.name}: valeur manquante {e}") from None
+
+
+class TemplateLibrary:
+    """Charge et compile tous les gabarits *.html d'un dossier"""
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.templates = {
+            path.stem: Template(path.read_text(encoding='utf-8'), path.stem)
+            for path in sorted(self.directory.glob('*.html'))
+        }
+
+    def __getitem__(self, name):
+        return self.templates[name]
+
+
+def json_for_script(data):
+    """Sérialise des données pour un bloc <script> sans risque de le refermer"""
+    return json.dumps(data, ensure_ascii=False).replace('</', '<\\/')
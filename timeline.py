@@ -0,0 +1,72 @@
+"""Versions successives d'une URL : chronologie et stockage en différences
+
+Une capture dont la page a déjà été archivée peut être stockée comme une liste
+d'opérations sur les lignes d'une version complète (keyframe) au lieu du HTML
+entier. Les différences portent toujours sur la keyframe, jamais sur la version
+précédente : relire une version coûte une keyframe et un delta, quelle que soit
+la longueur de la chronologie. Une nouvelle keyframe est stockée toutes les
+KEYFRAME_EVERY versions, ou dès que le delta dépasse MAX_DELTA_RATIO de la page.
+"""
+import bisect
+import difflib
+import json
+from datetime import datetime
+
+# Nombre maximal de deltas successifs sur une même keyframe
+KEYFRAME_EVERY = 10
+# Au-delà de cette fraction de la taille de la page, le delta ne vaut pas la peine
+MAX_DELTA_RATIO = 0.5
+DELTA_SUFFIX = '.delta'
+
+
+def line_delta(base, text):
+    """Opérations qui transforment base en text : [début, fin] copie des lignes
+    de base, une chaîne est insérée telle quelle"""
+    base_lines = base.splitlines(keepends=True)
+    lines = text.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(''.join(lines[j1:j2]))
+    return ops
+
+
+def apply_delta(base, ops):
+    """Reconstruit une version à partir de sa keyframe et de ses opérations"""
+    base_lines = base.splitlines(keepends=True)
+    return ''.join(op if isinstance(op, str) else ''.join(base_lines[op[0]:op[1]]) for op in ops)
+
+
+def encode_delta(base_sha256, ops):
+    return json.dumps({'base': base_sha256, 'ops': ops}, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def decode_delta(data):
+    """Retourne (empreinte de la keyframe, opérations)"""
+    delta = json.loads(data)
+    return delta['base'], delta['ops']
+
+
+def parse_when(when):
+    """Date ISO (2024-05-01, 2024-05-01T12:30) ou à la Wayback (20240501123000)"""
+    if isinstance(when, datetime):
+        return when
+    when = when.strip()
+    if when.isdigit():
+        return datetime.strptime(when.ljust(14, '0')[:14], "%Y%m%d%H%M%S")
+    return datetime.fromisoformat(when)
+
+
+def nearest_version(versions, when):
+    """Capture la plus proche d'une date parmi des versions triées, ou None"""
+    if not versions:
+        return None
+    target = parse_when(when)
+    times = [datetime.fromisoformat(v['timestamp']) for v in versions]
+    position = bisect.bisect_left(times, target)
+    candidates = [i for i in (position - 1, position) if 0 <= i < len(versions)]
+    return versions[min(candidates, key=lambda i: abs(times[i] - target))]
@@ -0,0 +1,187 @@
+"""Écriture des pages téléchargées au format WARC 1.1 (ISO 28500)
+
+Chaque échange est écrit sous la forme d'un enregistrement request et d'un
+enregistrement response, chacun compressé en un membre gzip distinct : un
+lecteur peut sauter directement à un enregistrement à partir de sa position.
+Les fichiers warc/archive-AAAAMMJJhhmmss-NNNNN.warc.gz changent dès que
+max_size est atteint ; warc/index.cdx (format CDX à 11 champs, trié à la
+fermeture) donne pour chaque URL le fichier et la position de sa réponse.
+Ces fichiers se rejouent avec les outils usuels (pywb, OpenWayback...).
+"""
+import base64
+import gzip
+import hashlib
+import os
+import uuid
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+CDX_HEADER = " CDX N b a m s k r M S V g\n"
+# En-têtes qui décrivent le transfert et plus le corps enregistré (déjà décompressé) :
+# conservés sous un autre nom, comme le font les outils de rejeu
+TRANSFER_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+ORIGINAL_HEADER_PREFIX = 'X-Archive-Orig-'
+
+
+def surt(url):
+    """Clé de tri d'une URL (« example.com/a?b » -> « com,example)/a?b »)"""
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    key = ','.join(reversed(host.split('.')))
+    if parts.port and parts.port not in (80, 443):
+        key += f":{parts.port}"
+    path = parts.path.lower() or '/'
+    return f"{key}){path}" + (f"?{parts.query.lower()}" if parts.query else '')
+
+
+def _sha1(data):
+    return "sha1:" + base64.b32encode(hashlib.sha1(data).digest()).decode('ascii')
+
+
+def _http_headers(headers):
+    return ''.join(f"{name}: {value}\r\n" for name, value in headers)
+
+
+def _response_headers(headers, body_length):
+    """En-têtes de la réponse tels qu'enregistrés avec le corps décompressé"""
+    names = {name.lower() for name, _ in headers}
+    if 'content-length' in names and not names & {'content-encoding', 'transfer-encoding'}:
+        # Corps reçu tel quel : rien à corriger
+        return list(headers)
+    kept = []
+    for name, value in headers:
+        if name.lower() in TRANSFER_HEADERS:
+            name = ORIGINAL_HEADER_PREFIX + name
+        kept.append((name, value))
+    kept.append(('Content-Length', str(body_length)))
+    return kept
+
+
+class WarcWriter:
+    """Ajoute des échanges HTTP à des fichiers WARC compressés par enregistrement"""
+    def __init__(self, directory, max_size=1024 * 1024 * 1024, software="Wayback Local"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.cdx_file = self.directory / "index.cdx"
+        self.max_size = max_size
+        self.software = software
+        self.prefix = f"archive-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        self.sequence = 0
+        self.file = None
+        self.path = None
+        self.cdx = open(self.cdx_file, 'a', encoding='utf-8')
+        self.records = 0
+
+    def _record(self, warc_type, headers, block):
+        """Un enregistrement WARC complet, compressé en un membre gzip"""
+        head = [('WARC-Type', warc_type), ('WARC-Record-ID', f"<urn:uuid:{uuid.uuid4()}>")]
+        head += headers
+        head += [('WARC-Block-Digest', _sha1(block)), ('Content-Length', str(len(block)))]
+        data = b"WARC/1.1\r\n" + _http_headers(head).encode('utf-8') + b"\r\n" + block + b"\r\n\r\n"
+        return head[1][1], gzip.compress(data, compresslevel=6)
+
+    def _open_next(self):
+        """Ferme le fichier courant et commence le suivant par un enregistrement warcinfo"""
+        if self.file is not None:
+            self.file.close()
+        self.sequence += 1
+        self.path = self.directory / f"{self.prefix}-{self.sequence:05d}.warc.gz"
+        self.file = open(self.path, 'ab')
+        info = _http_headers([('software', self.software), ('format', 'WARC File Format 1.1'),
+                              ('conformsTo', 'http://iipc.github.io/warc-specifications/'
+                                             'specifications/warc-format/warc-1.1/')]).encode('utf-8')
+        _, data = self._record('warcinfo', [
+            ('WARC-Date', datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')),
+            ('WARC-Filename', self.path.name),
+            ('Content-Type', 'application/warc-fields')
+        ], info)
+        self.file.write(data)
+
+    def write_exchange(self, url, request_headers, status, reason, http_version, response_headers, body,
+                       date=None):
+        """Écrit la requête et la réponse d'un téléchargement
+
+        body est le corps décompressé. Retourne {file, offset, length} de la réponse.
+        """
+        date = date or datetime.now(timezone.utc)
+        warc_date = date.strftime('%Y-%m-%dT%H:%M:%SZ')
+        if self.file is None or self.file.tell() >= self.max_size:
+            self._open_next()
+
+        headers = _response_headers(response_headers, len(body))
+        response_block = (f"{http_version} {status} {reason}\r\n".encode('latin-1') +
+                          _http_headers(headers).encode('latin-1', 'replace') + b"\r\n" + body)
+        response_id, response_data = self._record('response', [
+            ('WARC-Date', warc_date),
+            ('WARC-Target-URI', url),
+            ('WARC-Payload-Digest', _sha1(body)),
+            ('Content-Type', 'application/http;msgtype=response')
+        ], response_block)
+        parts = urlsplit(url)
+        target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        request_block = (f"GET {target} HTTP/1.1\r\n".encode('latin-1') +
+                         _http_headers([('Host', parts.netloc), *request_headers]).encode('latin-1', 'replace') +
+                         b"\r\n")
+        _, request_data = self._record('request', [
+            ('WARC-Date', warc_date),
+            ('WARC-Target-URI', url),
+            ('WARC-Concurrent-To', response_id),
+            ('Content-Type', 'application/http;msgtype=request')
+        ], request_block)
+
+        offset = self.file.tell()
+        self.file.write(response_data)
+        self.file.write(request_data)
+        self.file.flush()
+        self.records += 2
+
+        mimetype = next((value.split(';')[0].strip() for name, value in response_headers
+                         if name.lower() == 'content-type'), '-') or '-'
+        redirect = next((value for name, value in response_headers if name.lower() == 'location'), '-')
+        self.cdx.write(' '.join([
+            surt(url), date.strftime('%Y%m%d%H%M%S'), url, mimetype, str(status),
+            _sha1(body)[5:], redirect.replace(' ', '%20'), '-', str(len(response_data)), str(offset),
+            self.path.name
+        ]) + '\n')
+        self.cdx.flush()
+        return {'file': self.path.name, 'offset': offset, 'length': len(response_data)}
+
+    def close(self):
+        """Ferme le fichier WARC et trie l'index CDX (recherche par dichotomie des lecteurs)"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.cdx.close()
+        sort_cdx(self.cdx_file)
+
+
+def sort_cdx(path):
+    """Trie un fichier CDX sur place (en-tête en tête, lignes dédoublonnées)"""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = {line for line in f if line.strip() and line != CDX_HEADER}
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(CDX_HEADER)
+        f.writelines(sorted(lines))
+    os.replace(tmp_path, path)
+
+
+def read_record(path, offset):
+    """Relit l'enregistrement qui commence à offset ; retourne (en-têtes WARC, bloc)"""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    data = b''
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while not decompressor.eof:
+            chunk = f.read(64 * 1024)
+            if not chunk:
+                break
+            data += decompressor.decompress(chunk)
+    head, _, block = data.partition(b"\r\n\r\n")
+    headers = dict(line.split(': ', 1) for line in head.decode('utf-8').split('\r\n')[1:])
+    return headers, block[:int(headers['Content-Length'])]